@@ -0,0 +1,197 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — ANSWER KEYS
+# Compiled per-exam answer keys + in-process per-exam cache
+# =========================================
+#
+# Scoring used to re-read every Question row and re-parse correct_answer,
+# fill_answers and match_pairs on every single submission. An AnswerKey
+# does that parsing once per exam; submissions are then scored with plain
+# dict/set lookups. Short, Fill and Image answers go through the item's
+# AnswerMatcher (see answer_matching.py).
+
+import math
+import threading
+from collections import namedtuple
+
+from answer_matching import NORMALIZED, AnswerMatcher, normalize_text, split_answers
+
+
+# Types that lose Exam.negative points on a wrong (non-blank) answer
+PENALIZED_TYPES = ("MCQ", "TF", "Image")
+
+
+# Free-text types graded by an AnswerMatcher
+MATCHED_TYPES = ("Short", "Fill", "Image")
+
+
+# Points a single question may be worth
+MAX_POINTS = 1000
+
+
+def normalize(text):
+    return normalize_text(text)
+
+
+# "2", "2.0", 2 -> 2. Anything that is not a finite number between 0 and
+# MAX_POINTS ("inf", "nan", "ten") raises ValueError.
+def parse_points(value):
+    try:
+        points = float(value)
+    except (TypeError, ValueError):
+        points = math.nan
+    if not math.isfinite(points):
+        raise ValueError(f"points must be a number, got '{value}'")
+    if points < 0:
+        raise ValueError("points cannot be negative")
+    if points > MAX_POINTS:
+        raise ValueError(f"points cannot be more than {MAX_POINTS}")
+    return int(points)
+
+
+# One compiled question:
+#   correct  -> normalized correct answer (MCQ, TF, Short, Image)
+#   accepted -> frozenset of normalized answers (Fill)
+#   match    -> tuple of normalized right-hand sides (Match)
+#   matcher  -> AnswerMatcher over correct/accepted + variants (MATCHED_TYPES)
+KeyItem = namedtuple("KeyItem", "qid type correct accepted match points penalized matcher")
+
+
+class AnswerKey:
+    __slots__ = ("exam_id", "negative", "items", "total_points")
+
+    def __init__(self, exam_id, negative, items):
+        self.exam_id = exam_id
+        self.negative = negative or 0
+        self.items = tuple(items)
+        self.total_points = sum(item.points for item in self.items)
+
+    # ----------------------------------
+    # Pull this exam's answers out of a submitted form.
+    # Returns {question_id: answer}; Match answers are tuples.
+    # Blank answers are left out.
+    # ----------------------------------
+    def collect(self, form):
+        answers = {}
+
+        for item in self.items:
+            if item.type == "Match":
+                parts = tuple(
+                    form.get(f"q_{item.qid}_{i}", "")
+                    for i in range(1, len(item.match) + 1)
+                )
+                if any(p.strip() for p in parts):
+                    answers[item.qid] = parts
+            else:
+                answer = form.get(f"q_{item.qid}")
+                if answer:
+                    answers[item.qid] = answer
+
+        return answers
+
+    # ----------------------------------
+    # Is a single answer correct?
+    # ----------------------------------
+    def is_correct(self, item, answer):
+        if item.type == "Match":
+            return tuple(normalize(p) for p in answer) == item.match
+
+        if item.matcher is not None:
+            return item.matcher.matches(answer)
+
+        return normalize(answer) == item.correct
+
+    # ----------------------------------
+    # Score collected answers (never below 0)
+    # ----------------------------------
+    def score(self, answers):
+        score = 0
+
+        for item in self.items:
+            answer = answers.get(item.qid)
+            if not answer:
+                continue
+
+            if self.is_correct(item, answer):
+                score += item.points
+            elif item.penalized:
+                score -= self.negative
+
+        return max(score, 0)
+
+
+def compile_question(q, matching=NORMALIZED):
+    correct = normalize(q.correct_answer)
+    accepted = frozenset()
+    match = ()
+    matcher = None
+
+    if q.type == "Fill":
+        accepted = frozenset(normalize(x) for x in (q.fill_answers or "").split(","))
+
+    elif q.type == "Match":
+        rights = []
+        for pair in (q.match_pairs or "").split(","):
+            _, _, right = pair.partition(":")
+            rights.append(normalize(right))
+        match = tuple(rights)
+
+    if q.type in MATCHED_TYPES:
+        answers = split_answers(q.fill_answers) if q.type == "Fill" else [q.correct_answer or ""]
+        matcher = AnswerMatcher(answers + split_answers(q.answer_variants),
+                                mode=matching, max_edits=q.max_edits)
+
+    return KeyItem(
+        qid=q.id,
+        type=q.type,
+        correct=correct,
+        accepted=accepted,
+        match=match,
+        points=parse_points(q.points or 0),
+        penalized=q.type in PENALIZED_TYPES,
+        matcher=matcher,
+    )
+
+
+# matching: answer_matching mode for the free-text types
+def compile_answer_key(exam, questions, matching=NORMALIZED):
+    return AnswerKey(exam.id, exam.negative, [compile_question(q, matching) for q in questions])
+
+
+# ----------------------------------
+# CACHE — one compiled value per exam id (answer keys, exam papers, ...)
+# ----------------------------------
+class ExamCache:
+
+    def __init__(self):
+        self._keys = {}
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, exam_id, loader):
+        key = self._keys.get(exam_id)
+        if key is not None:
+            return key
+
+        with self._lock:
+            generation = (self._epoch, self._generations.get(exam_id, 0))
+
+        key = loader(exam_id)
+        if key is None:
+            return None
+
+        # Only keep the key if nobody invalidated the exam while we compiled
+        with self._lock:
+            if (self._epoch, self._generations.get(exam_id, 0)) == generation:
+                self._keys[exam_id] = key
+
+        return key
+
+    def invalidate(self, exam_id=None):
+        with self._lock:
+            if exam_id is None:
+                self._epoch += 1
+                self._keys.clear()
+            else:
+                self._generations[exam_id] = self._generations.get(exam_id, 0) + 1
+                self._keys.pop(exam_id, None)
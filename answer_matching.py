@@ -0,0 +1,226 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — ANSWER MATCHING
+# Normalized, variant-aware, typo-tolerant matching of free-text answers
+# =========================================
+#
+# Short, Fill and Image answers used to count only when strip().lower()
+# was exactly the stored answer, so "Mitocondria", "cell  membrane" or
+# "chloroplasts" sent teachers to re-grade by hand. An AnswerMatcher is
+# built once per question (in the compiled AnswerKey) and decides in
+# three steps, cheapest first:
+#
+#   1. match key: NFKC + casefold, punctuation and spacing dropped, simple
+#      English plurals made singular ("Cell-Membranes." -> "cellmembrane");
+#      the accepted answers' keys are a frozenset, so this is one lookup
+#   2. the accepted answers are the correct answer plus the question's
+#      answer_variants ("ATP synthase, ATPase")
+#   3. typos: bounded Levenshtein distance to each accepted key, giving
+#      up as soon as the distance is known to be too large
+#
+# Biology is full of opposites two letters apart (hypotonic/hypertonic,
+# endocytosis/exocytosis, anabolism/catabolism), so typo tolerance is
+# kept small: one edit, and only for answers of 5+ characters (none for
+# "ATP", where one letter is another term). A question's max_edits
+# overrides that (0 = no typo tolerance). Whatever the limit, an answer
+# whose prefix is the opposite of the accepted one's (hypo-/hyper-,
+# endo-/exo-/ecto-, ana-/cata- ...) never matches by typo, and answers
+# with digits are never fuzzy: "46" is not "47".
+#
+# Modes (ANSWER_MATCHING): "exact" = the whole answer, only case, spacing
+# and Unicode forms normalized (what MCQ/TF/Match get), "normalized" =
+# steps 1-2 with match keys, plus typos only for questions that set
+# max_edits (the default), "fuzzy" = all three for every question.
+
+import re
+import unicodedata
+
+
+EXACT = "exact"
+NORMALIZED = "normalized"
+FUZZY = "fuzzy"
+MODES = (EXACT, NORMALIZED, FUZZY)
+
+# (minimum key length, edits allowed); the last row that fits wins
+EDIT_STEPS = ((0, 0), (5, 1))
+
+# Prefixes with opposite meanings: keys starting with two different
+# prefixes of one group are different terms, not typos of each other
+OPPOSING_PREFIXES = (
+    ("hypo", "hyper"),
+    ("endo", "exo", "ecto"),
+    ("ender", "exer"),
+    ("ana", "cata"),
+    ("intra", "inter", "extra"),
+    ("homo", "hetero"),
+    ("auto", "hetero"),
+    ("pre", "post"),
+    ("macro", "micro"),
+)
+
+_WORDS = re.compile(r"\w+")
+
+
+# ----------------------------------
+# Unicode forms, case and spacing; used for every answer type
+# ----------------------------------
+def normalize_text(text):
+    text = text or ""
+    if text.isascii():
+        text = text.lower()
+    else:
+        text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(text.split())
+
+
+def singular(word):
+    if len(word) <= 3 or word[-1] != "s" or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("ses", "xes", "ches", "shes")):
+        return word[:-2]
+    return word[:-1]
+
+
+# "Cell-Membranes." -> "cellmembrane"
+def match_key(text):
+    return "".join(singular(word) for word in _WORDS.findall(normalize_text(text)))
+
+
+def split_answers(text):
+    return [part for part in (text or "").split(",") if part.strip()]
+
+
+def allowed_edits(key, max_edits=None):
+    if any(c.isdigit() for c in key):
+        return 0
+    if max_edits is not None:
+        return max(max_edits, 0)
+
+    edits = 0
+    for length, step in EDIT_STEPS:
+        if len(key) >= length:
+            edits = step
+    return edits
+
+
+def _prefix(key, group):
+    for prefix in group:
+        if key.startswith(prefix):
+            return prefix
+    return None
+
+
+def opposite_prefixes(a, b):
+    for group in OPPOSING_PREFIXES:
+        pa, pb = _prefix(a, group), _prefix(b, group)
+        if pa is not None and pb is not None and pa != pb:
+            return True
+    return False
+
+
+# ----------------------------------
+# Levenshtein distance of a and b, or limit + 1 as soon as it is known to
+# be more than limit. Only the diagonal band |i - j| <= limit is filled,
+# and a row whose best cell is over the limit ends the search.
+# ----------------------------------
+def bounded_distance(a, b, limit):
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    over = limit + 1
+    if len(b) - len(a) > limit:
+        return over
+
+    # A shared prefix / suffix costs nothing
+    start = 0
+    while start < len(a) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+
+    if not a:
+        return len(b) if len(b) <= limit else over
+
+    width = len(b)
+    previous = [j if j <= limit else over for j in range(width + 1)]
+
+    for i in range(1, len(a) + 1):
+        current = [over] * (width + 1)
+        current[0] = i if i <= limit else over
+        best = current[0]
+        char = a[i - 1]
+
+        for j in range(max(1, i - limit), min(width, i + limit) + 1):
+            value = min(previous[j - 1] + (char != b[j - 1]),
+                        previous[j] + 1,
+                        current[j - 1] + 1)
+            if value > over:
+                value = over
+            current[j] = value
+            if value < best:
+                best = value
+
+        if best > limit:
+            return over
+        previous = current
+
+    return previous[width] if previous[width] <= limit else over
+
+
+# ----------------------------------
+# Built once per question from its accepted answers
+# ----------------------------------
+class AnswerMatcher:
+    __slots__ = ("mode", "exact", "fuzzy")
+
+    def __init__(self, answers, mode=NORMALIZED, max_edits=None):
+        if mode not in MODES:
+            raise ValueError(f"unknown answer matching mode {mode!r}")
+        self.mode = mode
+
+        if mode == EXACT:
+            self.exact = frozenset(normalize_text(a) for a in answers) - {""}
+            self.fuzzy = ()
+            return
+
+        self.exact = frozenset(match_key(a) for a in answers) - {""}
+        # (key, edits allowed), longest first: those tolerate the most typos
+        self.fuzzy = ()
+        if mode == FUZZY or max_edits:
+            self.fuzzy = tuple(sorted(
+                ((key, allowed_edits(key, max_edits)) for key in self.exact
+                 if allowed_edits(key, max_edits) > 0),
+                key=lambda pair: (-len(pair[0]), pair[0])
+            ))
+
+    def matches(self, answer):
+        if self.mode == EXACT:
+            return normalize_text(answer) in self.exact
+
+        key = match_key(answer)
+        if not key:
+            return False
+        if key in self.exact:
+            return True
+        if not self.fuzzy or any(c.isdigit() for c in key):
+            return False
+
+        # A typo in the last letters can look like a plural ("photosynthesys"),
+        # so also try the words as they were typed
+        keys = {key, "".join(_WORDS.findall(normalize_text(answer)))}
+        for accepted, edits in self.fuzzy:
+            for candidate in keys:
+                if abs(len(accepted) - len(candidate)) > edits or opposite_prefixes(candidate, accepted):
+                    continue
+                if bounded_distance(candidate, accepted, edits) <= edits:
+                    return True
+        return False
+
+    # Identifies the rule, for caches keyed on the answer key
+    def signature(self):
+        return [self.mode, sorted(self.exact), [list(pair) for pair in self.fuzzy]]
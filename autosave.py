@@ -0,0 +1,68 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — AUTOSAVE
+# In-progress answers as compact {question_id: answer} deltas
+# =========================================
+#
+# The exam page posts only the form fields that changed since the last
+# save. Fields are folded into the same {question_id: answer} shape the
+# response store packs (Match parts become a tuple), so an in-progress
+# row costs about as much as a finished one.
+
+import re
+
+
+FIELD_RE = re.compile(r"^q_(\d+)(?:_(\d+))?$")
+
+# Guard rails for a single autosave request
+MAX_FIELDS = 500
+MAX_VALUE_LENGTH = 2000
+
+
+# ----------------------------------
+# Fold {"q_12": "B", "q_15_2": "nucleus"} into answers (in place).
+# Fields of questions not in qids (the exam's question ids) are dropped,
+# so a draft cannot grow past the exam.
+# ----------------------------------
+def apply_delta(answers, fields, qids=None):
+    for name, value in fields.items():
+        match = FIELD_RE.match(name)
+        if match is None or not isinstance(value, str):
+            continue
+
+        qid = int(match.group(1))
+        if qids is not None and qid not in qids:
+            continue
+        value = value[:MAX_VALUE_LENGTH]
+
+        if match.group(2) is None:
+            answers[qid] = value
+            continue
+
+        part = int(match.group(2))
+        if not 1 <= part <= 50:
+            continue
+
+        parts = list(answers.get(qid) or ())
+        if isinstance(answers.get(qid), str):
+            parts = []
+        parts.extend([""] * (part - len(parts)))
+        parts[part - 1] = value
+        answers[qid] = tuple(parts)
+
+    return answers
+
+
+# ----------------------------------
+# answers -> form fields (what the exam page would have posted)
+# ----------------------------------
+def answers_to_fields(answers):
+    fields = {}
+
+    for qid, answer in answers.items():
+        if isinstance(answer, tuple):
+            for i, part in enumerate(answer, start=1):
+                fields[f"q_{qid}_{i}"] = part
+        else:
+            fields[f"q_{qid}"] = answer
+
+    return fields
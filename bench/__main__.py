@@ -0,0 +1,89 @@
+# =========================================
+# BENCHMARKS — entry point
+# =========================================
+#
+#   python -m bench --students 100 --questions 40
+#   python -m bench --suite flow --mode gunicorn --workers 4 --output bench.json
+#
+# Runs against a throwaway SQLite database unless DATABASE_URL is set, and
+# prints (or writes) one JSON document so results can be compared across
+# versions.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Exam system benchmarks")
+    parser.add_argument("--suite", choices=["flow", "micro", "all"], default="all")
+    parser.add_argument("--mode", choices=["client", "gunicorn"], default="client",
+                        help="drive the flow through the Flask test client or a real gunicorn server")
+    parser.add_argument("--students", type=int, default=50, help="concurrent students in the flow")
+    parser.add_argument("--questions", type=int, default=40, help="questions in the benchmark exam")
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=1, help="gunicorn threads per worker")
+    parser.add_argument("--submissions", type=int, default=10000, help="scoring micro-benchmark size")
+    parser.add_argument("--attempts", type=int, default=20000, help="attempts seeded for /analytics")
+    parser.add_argument("--import-rows", type=int, default=5000, help="rows in the Excel import benchmark")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    workdir = None
+    if "DATABASE_URL" not in os.environ:
+        workdir = tempfile.mkdtemp(prefix="exam-bench-")
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(workdir, "bench.db")
+
+    import app as A
+    from bench.common import seed_exam
+
+    exam_id = seed_exam(A, args.questions, versions=args.versions)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": vars(args),
+        "results": {},
+    }
+
+    if args.suite in ("flow", "all"):
+        if args.mode == "gunicorn":
+            from bench.flow import run_gunicorn
+            report["results"]["flow"] = run_gunicorn(exam_id, args.students, args.workers, args.threads)
+        else:
+            from bench.flow import run_client
+            report["results"]["flow"] = run_client(A, exam_id, args.students)
+
+    if args.suite in ("micro", "all"):
+        from bench.micro import run_micro
+        report["results"]["micro"] = run_micro(A, exam_id, args.submissions, args.attempts,
+                                               args.import_rows)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    return 0 if not report["results"].get("flow", {}).get("flow", {}).get("errors") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# =========================================
+# BENCHMARKS — shared helpers
+# Latency recording, percentiles and test data
+# =========================================
+
+import random
+import threading
+import time
+
+
+class Recorder:
+
+    def __init__(self):
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            self._samples.setdefault(name, []).append(seconds)
+
+    def time(self, name):
+        return _Timer(self, name)
+
+    def summary(self, wall_seconds=None):
+        return {
+            name: summarize(samples, wall_seconds)
+            for name, samples in sorted(self._samples.items())
+        }
+
+
+class _Timer:
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add(self.name, time.perf_counter() - self.start)
+
+
+def percentile(sorted_samples, p):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(p / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+# ----------------------------------
+# Latencies in milliseconds; throughput per second of wall time
+# (or per second of summed latency when no wall time is given)
+# ----------------------------------
+def summarize(samples, wall_seconds=None):
+    ordered = sorted(samples)
+    total = sum(ordered)
+    elapsed = wall_seconds or total
+
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(total / len(ordered) * 1000, 3) if ordered else 0.0,
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "throughput_per_s": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+# ----------------------------------
+# Test data: one exam with a realistic mix of question types
+# ----------------------------------
+QUESTION_MIX = ("MCQ", "MCQ", "MCQ", "MCQ", "TF", "TF", "Short", "Fill", "Match")
+
+
+def question_row(exam_id, i, q_type):
+    row = {
+        "exam_id": exam_id,
+        "question_text": f"Benchmark question {i} about cell biology",
+        "type": q_type,
+        "points": 1,
+        "option_a": None,
+        "option_b": None,
+        "option_c": None,
+        "option_d": None,
+        "correct_answer": None,
+        "fill_answers": None,
+        "match_pairs": None,
+        "image_path": None,
+        "answer_variants": None,
+        "max_edits": None,
+    }
+
+    if q_type == "MCQ":
+        row.update(option_a="Nucleus", option_b="Ribosome", option_c="Mitochondria",
+                   option_d="Golgi body", correct_answer=random.choice("ABCD"))
+    elif q_type == "TF":
+        row["correct_answer"] = random.choice(["True", "False"])
+    elif q_type == "Short":
+        row["correct_answer"] = "photosynthesis"
+    elif q_type == "Fill":
+        row["fill_answers"] = "chlorophyll, chloroplast"
+    elif q_type == "Match":
+        row["match_pairs"] = "DNA:nucleus,ATP:mitochondria"
+
+    return row
+
+
+def seed_exam(app_module, questions, versions=3, negative=0.25):
+    A = app_module
+
+    with A.app.app_context():
+        A.init_db()
+
+        exam = A.Exam(title="Benchmark Exam", grade_id=1, duration=60,
+                      negative=negative, version_count=versions, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+
+        rows = [question_row(exam.id, i, QUESTION_MIX[i % len(QUESTION_MIX)])
+                for i in range(questions)]
+        A.db.session.execute(A.Question.__table__.insert(), rows)
+        A.db.session.commit()
+
+        return exam.id
+
+
+# ----------------------------------
+# A random but well-formed answer for each field of an exam page
+# ----------------------------------
+def random_answers(radio_groups, text_fields):
+    form = {name: random.choice(values) for name, values in radio_groups.items()}
+    for name in text_fields:
+        form[name] = random.choice(["photosynthesis", "chlorophyll", "nucleus", "mitochondria", ""])
+    return form
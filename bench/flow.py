@@ -0,0 +1,206 @@
+# =========================================
+# BENCHMARKS — full student exam flow
+# /student_login -> /select_exam -> /start_exam/<id> [-> exam paper API] -> /submit_exam
+# =========================================
+#
+# "client" mode drives the Flask test client from one thread per student.
+# "gunicorn" mode starts a real gunicorn server and drives it over HTTP.
+# All students wait on a barrier first, like a class clicking at 9:00.
+
+import http.cookiejar
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from bench.common import Recorder, random_answers
+
+
+RADIO_RE = re.compile(r'<input type="radio" name="(q_\d+)" value="([^"]+)"')
+TEXT_RE = re.compile(r'<(?:input type="text"|textarea)[^>]*name="(q_\d+(?:_\d+)?)"')
+
+
+PAPER_URL_RE = re.compile(r'data-paper-url="([^"]+)"')
+
+
+def parse_exam_page(html):
+    radio_groups = {}
+    for name, value in RADIO_RE.findall(html):
+        radio_groups.setdefault(name, []).append(value)
+    return radio_groups, TEXT_RE.findall(html)
+
+
+# Same fields as parse_exam_page, from the JSON delivery API
+def parse_exam_paper(body):
+    radio_groups = {}
+    text_fields = []
+    for q in json.loads(body)["questions"]:
+        name = f"q_{q['id']}"
+        if q["type"] == "MCQ":
+            radio_groups[name] = ["ABCD"[i] for i in range(len(q["options"]))]
+        elif q["type"] == "TF":
+            radio_groups[name] = ["True", "False"]
+        elif q["type"] == "Match":
+            text_fields += [f"{name}_{i}" for i in range(1, len(q["match"]) + 1)]
+        else:
+            text_fields.append(name)
+    return radio_groups, text_fields
+
+
+# ----------------------------------
+# Test client transport
+# ----------------------------------
+class ClientSession:
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.get_data(as_text=True)
+
+    def post(self, path, form):
+        response = self.client.post(path, data=form)
+        return response.status_code, response.get_data(as_text=True)
+
+
+# ----------------------------------
+# Real HTTP transport (cookies kept per student)
+# ----------------------------------
+class HttpSession:
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+            _NoRedirect()
+        )
+
+    def _open(self, request):
+        try:
+            with self.opener.open(request, timeout=60) as response:
+                return response.status, response.read().decode("utf-8", "replace")
+        except urllib.error.HTTPError as error:
+            return error.code, error.read().decode("utf-8", "replace")
+
+    def get(self, path):
+        return self._open(urllib.request.Request(self.base_url + path))
+
+    def post(self, path, form):
+        body = urllib.parse.urlencode(form).encode()
+        return self._open(urllib.request.Request(self.base_url + path, data=body))
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Each step is timed on its own, so redirects are not followed
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def student_flow(session, exam_id, number, recorder, errors):
+    def step(name, call):
+        start = time.perf_counter()
+        status, body = call()
+        recorder.add(name, time.perf_counter() - start)
+        if status >= 400:
+            errors.append(f"{name}: HTTP {status}")
+        return body
+
+    step("student_login", lambda: session.post("/student_login", {
+        "student_name": f"Bench Student {number}", "grade": "1", "class_code": "BENCH"
+    }))
+    step("select_exam", lambda: session.get("/select_exam"))
+    page = step("start_exam", lambda: session.get(f"/start_exam/{exam_id}"))
+
+    paper_url = PAPER_URL_RE.search(page)
+    if paper_url:
+        paper = step("exam_paper", lambda: session.get(paper_url.group(1)))
+        radio_groups, text_fields = parse_exam_paper(paper)
+    else:
+        radio_groups, text_fields = parse_exam_page(page)
+    form = random_answers(radio_groups, text_fields)
+    form["violations"] = "0"
+
+    step("submit_exam", lambda: session.post("/submit_exam", form))
+
+
+def run_students(make_session, exam_id, students):
+    recorder = Recorder()
+    errors = []
+    barrier = threading.Barrier(students)
+
+    def worker(number):
+        session = make_session()
+        barrier.wait()
+        student_flow(session, exam_id, number, recorder, errors)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(students)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    results = recorder.summary(wall)
+    results["flow"] = {
+        "students": students,
+        "wall_seconds": round(wall, 3),
+        "students_per_s": round(students / wall, 2) if wall else 0.0,
+        "errors": len(errors),
+        "error_samples": errors[:10],
+    }
+    return results
+
+
+def run_client(app_module, exam_id, students):
+    return run_students(lambda: ClientSession(app_module.app), exam_id, students)
+
+
+# ----------------------------------
+# gunicorn mode — the server gets the same DATABASE_URL as the seeder
+# ----------------------------------
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"gunicorn did not start on port {port}")
+
+
+def run_gunicorn(exam_id, students, workers=4, threads=1):
+    port = _free_port()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:create_app()",
+         "-b", f"127.0.0.1:{port}", "-w", str(workers), "--threads", str(threads),
+         "--log-level", "warning"],
+        cwd=root,
+        env=dict(os.environ),
+    )
+    try:
+        _wait_for_port(port)
+        results = run_students(lambda: HttpSession(f"http://127.0.0.1:{port}"), exam_id, students)
+        results["flow"]["gunicorn_workers"] = workers
+        results["flow"]["gunicorn_threads"] = threads
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
@@ -0,0 +1,118 @@
+# =========================================
+# BENCHMARKS — micro-benchmarks
+# Scoring, vectorized re-grading, /analytics and Excel import
+# =========================================
+
+import io
+import random
+import time
+
+from openpyxl import Workbook
+
+from bench.common import Recorder, question_row, seed_exam, summarize
+from excel_import import import_questions
+from regrade import ResponseMatrix, score_matrix
+
+
+def bench_scoring(A, exam_id, submissions):
+    recorder = Recorder()
+
+    with A.app.app_context():
+        A.answer_keys.invalidate(exam_id)
+        with recorder.time("answer_key_compile"):
+            key = A.get_answer_key(exam_id)
+
+    forms = []
+    for _ in range(submissions):
+        form = {}
+        for item in key.items:
+            if item.type == "Match":
+                for i in range(1, len(item.match) + 1):
+                    form[f"q_{item.qid}_{i}"] = random.choice(["nucleus", "mitochondria"])
+            elif item.type == "MCQ":
+                form[f"q_{item.qid}"] = random.choice("ABCD")
+            elif item.type == "TF":
+                form[f"q_{item.qid}"] = random.choice(["True", "False"])
+            else:
+                # Exact, misspelt and wrong answers, so the fuzzy matcher is exercised
+                form[f"q_{item.qid}"] = random.choice(["photosynthesis", "Photosynthesys", "chlorophyll",
+                                                        "chlorophyl", "chloroplasts", "mitochondria", ""])
+        forms.append(form)
+
+    for form in forms:
+        with recorder.time("score_submission"):
+            key.score(key.collect(form))
+
+    # Whole-exam re-grade over the same answers
+    matrix = ResponseMatrix(key)
+    start = time.perf_counter()
+    for attempt_id, form in enumerate(forms, start=1):
+        matrix.add(attempt_id, key.collect(form))
+    recorder.add("regrade_build_matrix", time.perf_counter() - start)
+
+    with recorder.time("regrade_score_matrix"):
+        score_matrix(matrix)
+
+    return recorder.summary()
+
+
+def bench_analytics(A, exam_id, attempts, requests):
+    recorder = Recorder()
+
+    with A.app.app_context():
+        key = A.get_answer_key(exam_id)
+        rows = [
+            {"student_name": f"Student {i}", "grade": "1", "exam_id": exam_id,
+             "score": random.uniform(0, key.total_points), "violations": 0}
+            for i in range(attempts)
+        ]
+        A.db.session.execute(A.Attempt.__table__.insert(), rows)
+        A.record_attempt_scores((exam_id, "1", r["score"], key.total_points) for r in rows)
+        A.db.session.commit()
+
+    client = A.app.test_client()
+    with client.session_transaction() as session:
+        session["role"] = "Admin"
+
+    for _ in range(requests):
+        with recorder.time("analytics_page"):
+            client.get("/analytics")
+        with recorder.time("analytics_drilldown"):
+            client.get(f"/analytics?exam_id={exam_id}&page=2")
+
+    return recorder.summary()
+
+
+def bench_excel_import(A, rows):
+    exam_id = seed_exam(A, questions=0)
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["Question", "Type", "Option A", "Option B", "Option C", "Option D",
+                  "Correct", "Points", "Fill Answers", "Match Pairs"])
+    for i in range(rows):
+        r = question_row(exam_id, i, "MCQ")
+        sheet.append([r["question_text"], "MCQ", r["option_a"], r["option_b"],
+                      r["option_c"], r["option_d"], r["correct_answer"], 1, None, None])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    with A.app.app_context():
+        start = time.perf_counter()
+        report = import_questions(A.db.session, A.Question.__table__, exam_id, buffer)
+        A.db.session.commit()
+        elapsed = time.perf_counter() - start
+
+    result = summarize([elapsed])
+    result["rows"] = report.rows
+    result["rows_per_s"] = round(report.rows / elapsed, 1) if elapsed else 0.0
+    return {"excel_import": result}
+
+
+def run_micro(A, exam_id, submissions, attempts, import_rows, requests=20):
+    results = {}
+    results.update(bench_scoring(A, exam_id, submissions))
+    results.update(bench_analytics(A, exam_id, attempts, requests))
+    results.update(bench_excel_import(A, import_rows))
+    return results
@@ -0,0 +1,119 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — EXAM CLOCK
+# Server-Sent Events for time sync and forced submit
+# =========================================
+#
+# start_exam gives the page a signed clock token holding the student's
+# deadline. The page opens an EventSource on it and receives:
+#
+#   event: clock   {"now": <ms>, "deadline": <ms>}   on connect + heartbeat
+#   event: submit  {"now": <ms>, "deadline": <ms>}   when time is up
+#
+# The token is all the stream needs, so serving it never touches the
+# database. serve() is an asyncio server: an open exam costs one sleeping
+# coroutine, so a single process holds thousands of them. There is no
+# Flask route for it: a stream held open for the whole exam would take a
+# worker thread per student. Without EXAM_CLOCK_URL the page just counts
+# down from the deadline and server time it was rendered with.
+
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from itsdangerous import BadSignature, URLSafeSerializer
+
+
+log = logging.getLogger("exam.clock")
+
+HEARTBEAT_SECONDS = 30
+RETRY_MS = 3000
+MAX_HEADER_BYTES = 8192
+
+
+def _serializer(secret):
+    return URLSafeSerializer(secret, salt="exam-clock")
+
+
+def make_token(secret, deadline):
+    return _serializer(secret).dumps({"deadline": deadline})
+
+
+# Deadline (epoch seconds) from a token, or None if it is not ours
+def read_token(secret, token):
+    try:
+        return float(_serializer(secret).loads(token)["deadline"])
+    except (BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+# ----------------------------------
+# The event to send now, and how long to wait before the next one
+# (None = time is up, close the stream)
+# ----------------------------------
+def next_event(deadline, now, heartbeat=HEARTBEAT_SECONDS):
+    data = json.dumps({"now": int(now * 1000), "deadline": int(deadline * 1000)})
+
+    if now >= deadline:
+        return f"event: submit\ndata: {data}\n\n", None
+    return f"event: clock\ndata: {data}\n\n", min(heartbeat, deadline - now)
+
+
+# ----------------------------------
+# asyncio server (`flask exam-clock --port 8001`)
+# ----------------------------------
+async def _handle(reader, writer, secret):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=10)
+        size = len(request_line)
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout=10)
+            size += len(line)
+            if line in (b"\r\n", b"\n", b"") or size > MAX_HEADER_BYTES:
+                break
+
+        parts = request_line.decode("latin-1").split()
+        query = parse_qs(urlsplit(parts[1]).query) if len(parts) == 3 else {}
+        deadline = read_token(secret, query.get("token", [""])[0])
+
+        if parts[:1] != ["GET"] or deadline is None:
+            writer.write(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n"
+            b"Access-Control-Allow-Origin: *\r\n"
+            b"X-Accel-Buffering: no\r\n\r\n"
+            + f"retry: {RETRY_MS}\n\n".encode()
+        )
+
+        while True:
+            event, wait = next_event(deadline, time.time())
+            writer.write(event.encode())
+            await writer.drain()
+            if wait is None:
+                return
+            await asyncio.sleep(wait)
+
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(secret, host="127.0.0.1", port=8001):
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle(reader, writer, secret), host, port, backlog=1024
+    )
+    log.info("exam clock listening on %s:%d", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def run(secret, host="127.0.0.1", port=8001):
+    asyncio.run(serve(secret, host, port))
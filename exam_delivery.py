@@ -0,0 +1,118 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — EXAM DELIVERY API
+# One exam version as compact JSON, with ETags and pre-compressed bodies
+# =========================================
+#
+# /api/exam/<id>/paper/<version> returns what the exam page used to
+# render inline; exam_paper.js builds the same form from it. The body is
+# the same for every student on that version, so it is built, hashed and
+# compressed once and kept in exam_fragments next to the HTML fragment:
+#
+#   - each distinct string (question text, option, match prompt) is sent
+#     once in "strings" and referenced by index, so options repeated
+#     across questions ("All of the above", organ names) cost a number
+#   - the ETag is the hash of the JSON: a reload revalidates with
+#     If-None-Match and gets a 304 without a body
+#   - gzip always, brotli when the package is installed, picked from
+#     Accept-Encoding
+#
+# Only what the student sees is sent. The ExamPaper has no answer key,
+# and MCQ options go out in displayed order without their original
+# letters, so the payload does not give away the shuffle either.
+
+import gzip
+import hashlib
+import json
+
+brotli = None
+_brotli_loaded = False
+
+
+FORMAT = 1
+
+# Server preference when the client accepts several
+ENCODINGS = ("br", "gzip")
+
+
+class StringTable:
+
+    def __init__(self):
+        self.strings = []
+        self._index = {}
+
+    def ref(self, text):
+        text = "" if text is None else str(text)
+        index = self._index.get(text)
+        if index is None:
+            index = self._index[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+
+# ----------------------------------
+# ExamPaper -> payload dict. image_sources(image_path) gives the
+# {"src", "srcset"} of an image question (app.image_sources).
+# ----------------------------------
+def compact_paper(paper, image_sources):
+    strings = StringTable()
+    questions = []
+
+    for q in paper.questions:
+        item = {"id": q["id"], "type": q["type"], "text": strings.ref(q["text"])}
+
+        if q["type"] == "MCQ":
+            item["options"] = [strings.ref(option) for _, option in q["options"]]
+        elif q["type"] == "Match":
+            item["match"] = [strings.ref(left) for left in q["match_left"]]
+        elif q["type"] == "Image" and q.get("image_path"):
+            item["image"] = image_sources(q["image_path"])
+
+        questions.append(item)
+
+    return {
+        "format": FORMAT,
+        "exam_id": paper.exam_id,
+        "version": paper.version,
+        "title": paper.title,
+        "duration": paper.duration,
+        "strings": strings.strings,
+        "questions": questions,
+    }
+
+
+def encode(payload):
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def etag(body):
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def brotli_supported():
+    global brotli, _brotli_loaded
+    if not _brotli_loaded:
+        try:
+            import brotli
+        except ImportError:
+            pass
+        _brotli_loaded = True
+    return brotli is not None
+
+
+def available_encodings():
+    return [e for e in ENCODINGS if e != "br" or brotli_supported()]
+
+
+# Built once per version and cached, so take the slow, small settings
+def compress(body, encoding):
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == "br":
+        brotli_supported()
+        return brotli.compress(body, quality=11)
+    raise ValueError(f"unknown encoding {encoding!r}")
+
+
+# accept_encodings: werkzeug's request.accept_encodings
+def pick_encoding(accept_encodings):
+    return accept_encodings.best_match(available_encodings(), default="identity")
@@ -0,0 +1,139 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — EXAM SCHEDULE
+# Open/close windows, pre-warming, paced admission of exam starts
+# =========================================
+#
+# A scheduled exam has opens_at / closes_at. A few minutes before it
+# opens, each worker's Prewarmer loads the answer key, builds the
+# versions, renders the question bodies and compiles the templates, so
+# the first student is not the one paying for cold caches.
+#
+# When the whole class clicks at 9:00, two things turn the spike into a
+# ramp:
+#   - students who arrive early wait on a page that reloads at
+#     opens_at + a random 0..spread seconds, not all at opens_at
+#   - AdmissionQueue admits exam starts at a fixed rate per worker;
+#     a start that would wait longer than max_wait (a few tens of
+#     milliseconds) is asked to come back (503 + Retry-After) instead of
+#     holding a worker thread in sleep()
+
+import atexit
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+log = logging.getLogger("exam.schedule")
+
+SCHEDULED = "scheduled"
+OPEN = "open"
+CLOSED = "closed"
+
+
+def window_state(opens_at, closes_at, now=None):
+    now = now or datetime.now()
+    if opens_at is not None and now < opens_at:
+        return SCHEDULED
+    if closes_at is not None and now >= closes_at:
+        return CLOSED
+    return OPEN
+
+
+# Seconds until a waiting page should reload, spread over `spread`
+def retry_delay(seconds, spread):
+    return max(1, int(seconds + random.uniform(0, spread)))
+
+
+# ----------------------------------
+# Virtual queue: every admitted start takes the next 1/rate-second slot.
+# `burst` starts go through at once after a quiet period.
+# ----------------------------------
+class AdmissionQueue:
+
+    def __init__(self, rate, burst=10, max_wait=0.05, clock=time.monotonic):
+        self.interval = 1.0 / rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.clock = clock
+        self._next = 0.0
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.deferred = 0
+
+    # (True, seconds to wait first) or (False, seconds until a slot frees)
+    def reserve(self):
+        with self._lock:
+            now = self.clock()
+            start = max(self._next, now - self.burst * self.interval)
+            wait = start - now
+            if wait > self.max_wait:
+                self.deferred += 1
+                return False, wait
+
+            self._next = start + self.interval
+            self.admitted += 1
+            return True, max(wait, 0.0)
+
+
+# ----------------------------------
+# Background pre-warming, one thread per worker
+# ----------------------------------
+# find_upcoming(now, until) -> [(exam_id, opens_at)] for exams opening
+# before `until` and not yet closed; warm(exam_id) fills the caches.
+class Prewarmer:
+
+    def __init__(self, find_upcoming, warm, lead_minutes=10, interval=30):
+        self.find_upcoming = find_upcoming
+        self.warm = warm
+        self.lead = timedelta(minutes=lead_minutes)
+        self.interval = interval
+        self._warmed = {}  # exam_id -> opens_at it was warmed for
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def ensure_started(self):
+        # Started lazily so each gunicorn worker gets its own live thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="exam-prewarm", daemon=True)
+                self._thread.start()
+                atexit.register(self._stop.set)
+
+    # The exam changed (questions edited): warm it again on the next pass
+    def forget(self, exam_id):
+        with self._lock:
+            self._warmed.pop(exam_id, None)
+
+    def run_once(self, now=None):
+        now = now or datetime.now()
+        warmed = []
+
+        for exam_id, opens_at in self.find_upcoming(now, now + self.lead):
+            if self._warmed.get(exam_id, False) == opens_at:
+                continue
+            start = time.perf_counter()
+            try:
+                self.warm(exam_id)
+            except Exception:
+                log.exception("pre-warming exam %s failed", exam_id)
+                continue
+            with self._lock:
+                self._warmed[exam_id] = opens_at
+            warmed.append(exam_id)
+            log.info("pre-warmed exam %s (opens %s) in %.3fs",
+                     exam_id, opens_at, time.perf_counter() - start)
+
+        return warmed
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                log.exception("pre-warm pass failed")
+            self._stop.wait(self.interval)
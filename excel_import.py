@@ -0,0 +1,209 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — EXCEL IMPORT
+# Streaming, validated question import with chunked bulk inserts
+# =========================================
+#
+# The sheet is read row by row with openpyxl in read-only mode, so memory
+# stays flat no matter how many rows it has. Valid rows are inserted in
+# fixed-size chunks through Core insert(); invalid rows are reported with
+# their sheet row number and skipped.
+
+import time
+
+from answer_key import parse_points
+
+
+QUESTION_TYPES = ("MCQ", "TF", "Short", "Fill", "Match", "Image")
+
+# Accepted header spellings -> Question field
+HEADER_ALIASES = {
+    "question": "question_text",
+    "question_text": "question_text",
+    "type": "type",
+    "option_a": "option_a",
+    "option_b": "option_b",
+    "option_c": "option_c",
+    "option_d": "option_d",
+    "correct": "correct_answer",
+    "correct_answer": "correct_answer",
+    "answer": "correct_answer",
+    "points": "points",
+    "marks": "points",
+    "fill_answers": "fill_answers",
+    "match_pairs": "match_pairs",
+    "image_path": "image_path",
+    "answer_variants": "answer_variants",
+    "also_accept": "answer_variants",
+    "max_edits": "max_edits",
+}
+
+
+class ImportReport:
+
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.errors = []   # (sheet row number, message)
+        self.seconds = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _header_key(value):
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _cell_text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value)
+    # Undo the "'" exports.safe_cell puts before formula-like text
+    if text.startswith("'") and text[1:2] in ("=", "+", "-", "@", "\t", "\r"):
+        text = text[1:]
+    text = text.strip()
+    return text or None
+
+
+# ----------------------------------
+# Validate one sheet row and map it to Question columns.
+# Raises ValueError with a readable message.
+# ----------------------------------
+def map_row(fields, exam_id):
+    text = fields.get("question_text")
+    if not text:
+        raise ValueError("missing question text")
+
+    q_type = fields.get("type") or "MCQ"
+    q_type = {t.lower(): t for t in QUESTION_TYPES}.get(q_type.lower())
+    if q_type is None:
+        raise ValueError(f"unknown type '{fields.get('type')}'")
+
+    points = parse_points(fields.get("points") or "1")
+
+    row = {
+        "exam_id": exam_id,
+        "question_text": text,
+        "type": q_type,
+        "points": points,
+        "option_a": None,
+        "option_b": None,
+        "option_c": None,
+        "option_d": None,
+        "correct_answer": None,
+        "match_pairs": None,
+        "fill_answers": None,
+        "image_path": None,
+        "answer_variants": None,
+        "max_edits": None,
+    }
+    correct = fields.get("correct_answer")
+
+    if q_type == "MCQ":
+        for letter in "abcd":
+            row[f"option_{letter}"] = fields.get(f"option_{letter}")
+        if not row["option_a"] or not row["option_b"]:
+            raise ValueError("MCQ needs at least option A and option B")
+        if not correct or len(correct) != 1 or correct.upper() not in "ABCD":
+            raise ValueError("MCQ correct answer must be A, B, C or D")
+        if not row[f"option_{correct.lower()}"]:
+            raise ValueError(f"correct answer {correct.upper()} has no option text")
+        row["correct_answer"] = correct.upper()
+
+    elif q_type == "TF":
+        value = {"true": "True", "t": "True", "false": "False", "f": "False"}.get((correct or "").lower())
+        if value is None:
+            raise ValueError("TF correct answer must be True or False")
+        row["correct_answer"] = value
+
+    elif q_type in ("Short", "Image"):
+        if not correct:
+            raise ValueError(f"{q_type} question needs a correct answer")
+        row["correct_answer"] = correct
+        if q_type == "Image":
+            row["image_path"] = fields.get("image_path")
+
+    elif q_type == "Fill":
+        answers = fields.get("fill_answers") or correct
+        if not answers:
+            raise ValueError("Fill question needs fill_answers")
+        row["fill_answers"] = answers
+
+    elif q_type == "Match":
+        pairs = fields.get("match_pairs")
+        if not pairs or any(":" not in p for p in pairs.split(",")):
+            raise ValueError("Match pairs must look like 'left:right,left2:right2'")
+        row["match_pairs"] = pairs
+
+    if q_type in ("Short", "Fill", "Image"):
+        row["answer_variants"] = fields.get("answer_variants")
+        max_edits = fields.get("max_edits")
+        if max_edits:
+            try:
+                row["max_edits"] = int(float(max_edits))
+            except ValueError:
+                raise ValueError(f"max_edits must be a number, got '{max_edits}'")
+            if row["max_edits"] < 0:
+                raise ValueError("max_edits cannot be negative")
+
+    return row
+
+
+# ----------------------------------
+# Yield (sheet row number, {field: text}) for every non-empty data row
+# ----------------------------------
+def iter_sheet_rows(stream):
+    from openpyxl import load_workbook  # heavy; only imports need it
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        columns = [HEADER_ALIASES.get(_header_key(h)) for h in header]
+        if "question_text" not in columns:
+            raise ValueError("Sheet has no 'Question' column")
+
+        for number, values in enumerate(rows, start=2):
+            fields = {}
+            for field, value in zip(columns, values):
+                if field is not None:
+                    fields[field] = _cell_text(value)
+            if any(fields.values()):
+                yield number, fields
+    finally:
+        workbook.close()
+
+
+# ----------------------------------
+# Import every valid row into `table` (the Question table) for one exam
+# ----------------------------------
+def import_questions(session, table, exam_id, stream, chunk_size=500):
+    report = ImportReport()
+    start = time.perf_counter()
+    chunk = []
+
+    for number, fields in iter_sheet_rows(stream):
+        report.rows += 1
+        try:
+            chunk.append(map_row(fields, exam_id))
+        except ValueError as error:
+            report.errors.append((number, str(error)))
+            continue
+
+        if len(chunk) >= chunk_size:
+            session.execute(table.insert(), chunk)
+            report.inserted += len(chunk)
+            chunk = []
+
+    if chunk:
+        session.execute(table.insert(), chunk)
+        report.inserted += len(chunk)
+
+    report.seconds = time.perf_counter() - start
+    return report
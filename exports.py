@@ -0,0 +1,86 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — EXPORTS
+# Constant-memory CSV / XLSX writers for large result sets
+# =========================================
+#
+# Both writers take an iterator of row tuples (normally a server-side
+# cursor) and never hold more than one chunk of rows in memory.
+#
+# Text cells are free text (student names typed at login, question text),
+# so any that a spreadsheet would read as a formula gets a leading "'".
+
+import csv
+import io
+import tempfile
+
+
+CSV_CHUNK_ROWS = 1000
+
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+# "=HYPERLINK(...)" -> "'=HYPERLINK(...)"; other values unchanged
+def safe_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def safe_row(row):
+    return [safe_cell(value) for value in row]
+
+
+# ----------------------------------
+# CSV — generator of UTF-8 byte chunks, suitable for a streamed Response
+# ----------------------------------
+def csv_chunks(header, rows, chunk_rows=CSV_CHUNK_ROWS):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # BOM so Excel opens the file as UTF-8
+    buffer.write("\ufeff")
+    writer.writerow(safe_row(header))
+
+    pending = 0
+    for row in rows:
+        writer.writerow(safe_row(row))
+        pending += 1
+
+        if pending >= chunk_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+# ----------------------------------
+# XLSX — write-only workbook spooled to a temporary file, then read back
+# in blocks. openpyxl's write-only mode keeps rows on disk, not in memory.
+# ----------------------------------
+def xlsx_chunks(header, rows, sheet_title="Export", block_size=64 * 1024):
+    from openpyxl import Workbook  # heavy; only exports need it
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title)
+    sheet.append(safe_row(header))
+
+    for row in rows:
+        sheet.append(safe_row(row))
+
+    with tempfile.TemporaryFile() as out:
+        workbook.save(out)
+        out.seek(0)
+
+        while True:
+            block = out.read(block_size)
+            if not block:
+                break
+            yield block
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", csv_chunks),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", xlsx_chunks),
+}
@@ -0,0 +1,121 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — GRADING QUEUE
+# Durable job table, batch claiming with leases, retries, worker processes
+# =========================================
+#
+# In async grading mode submit_exam only stores a job row and answers with
+# a receipt. Worker processes claim queued jobs in batches, score them and
+# write the attempts; the student's page polls for the result.
+#
+# A job is claimable when it is "queued" (or "running" with an expired
+# lease, i.e. its worker died) and its not_before time has passed. Claiming
+# is a single UPDATE, so two workers never get the same job.
+
+import logging
+import multiprocessing
+import os
+import secrets
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, select, update
+
+
+log = logging.getLogger("exam.grading")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def new_receipt():
+    return secrets.token_urlsafe(12)
+
+
+def queue_depth(session, model):
+    return session.query(model).filter(model.status.in_([QUEUED, RUNNING])).count()
+
+
+# ----------------------------------
+# Claim up to `limit` jobs for this worker (commits)
+# ----------------------------------
+def claim_jobs(session, model, worker, limit, lease_seconds):
+    now = datetime.now()
+    claimable = or_(
+        model.status == QUEUED,
+        (model.status == RUNNING) & (model.lease_until < now),
+    ) & or_(model.not_before.is_(None), model.not_before <= now)
+
+    ids = select(model.id).where(claimable).order_by(model.id).limit(limit)
+
+    session.execute(
+        update(model)
+        .where(model.id.in_(ids), claimable)
+        .values(status=RUNNING, worker=worker, tries=model.tries + 1,
+                lease_until=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+
+    return (
+        session.query(model)
+        .filter(model.status == RUNNING, model.worker == worker)
+        .order_by(model.id)
+        .all()
+    )
+
+
+# ----------------------------------
+# A job that raised: back to the queue with backoff, or failed for good
+# ----------------------------------
+def release_job(session, model, job_id, worker, error, max_tries, backoff_seconds):
+    job = session.get(model, job_id)
+    if job is None or job.worker != worker:
+        # Lease expired and another worker owns it now
+        return
+
+    job.error = str(error)[:1000]
+    job.worker = None
+
+    if job.tries >= max_tries:
+        job.status = FAILED
+        job.finished_at = datetime.now()
+        log.error("grading job %s failed after %d tries: %s", job_id, job.tries, error)
+    else:
+        job.status = QUEUED
+        job.not_before = datetime.now() + timedelta(seconds=backoff_seconds * 2 ** (job.tries - 1))
+        log.warning("grading job %s failed (try %d), will retry: %s", job_id, job.tries, error)
+
+    session.commit()
+
+
+# ----------------------------------
+# Worker loop
+# ----------------------------------
+# claim() returns a list of jobs (empty when there is nothing to do) and
+# grade(jobs) handles one batch. With drain=True the loop returns once the
+# queue is empty instead of sleeping.
+def run_worker(claim, grade, poll_interval=0.5, drain=False):
+    graded = 0
+
+    while True:
+        jobs = claim()
+        if not jobs:
+            if drain:
+                return graded
+            time.sleep(poll_interval)
+            continue
+
+        grade(jobs)
+        graded += len(jobs)
+
+
+def start_worker_processes(target, processes):
+    # fork: each child inherits the imported app and opens its own connections
+    context = multiprocessing.get_context("fork" if os.name == "posix" else "spawn")
+    workers = [context.Process(target=target, name=f"grading-worker-{n}", daemon=False)
+               for n in range(processes)]
+    for worker in workers:
+        worker.start()
+    return workers
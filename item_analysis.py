@@ -0,0 +1,180 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — ITEM ANALYSIS
+# Difficulty, discrimination, distractors and KR-20 from running sums
+# =========================================
+#
+# Everything is derived from sufficient statistics that only ever grow, so
+# new attempts are folded in without re-reading old ones. With x the 0/1
+# correctness of an item and u the number of items a student got right:
+#
+#   n, Σx, Σx·u per item, Σu, Σu²        (Σx² = Σx since x is 0/1)
+#   option counts per MCQ/TF item        (omitted, each option, other)
+#
+#   p-value        Σx / n
+#   point-biserial correlation of x with the rest score u - x
+#                  (the item itself is left out of the total)
+#   KR-20          k/(k-1) · (1 - Σ p·q / var(u))
+#
+# Each ResponseMatrix batch is added with a handful of NumPy operations.
+
+import hashlib
+import json
+
+import numpy as np
+
+from regrade import FIXED_VOCABULARIES, correctness_matrix
+
+
+# omitted + up to four fixed options + anything else
+OPTION_SLOTS = 6
+
+
+# ----------------------------------
+# Identifies the answer key the statistics were computed against; when it
+# changes (questions edited, added, removed) they are rebuilt.
+# ----------------------------------
+def key_signature(key):
+    items = [
+        [item.qid, item.type, item.correct, sorted(item.accepted), list(item.match), item.points,
+         item.matcher.signature() if item.matcher is not None else None]
+        for item in key.items
+    ]
+    return hashlib.sha1(json.dumps(items, default=str).encode()).hexdigest()
+
+
+class ItemStats:
+
+    def __init__(self, qids):
+        m = len(qids)
+        self.qids = list(qids)
+        self.n = 0
+        self.last_attempt_id = 0
+        self.sum_u = 0.0
+        self.sum_uu = 0.0
+        self.sum_x = np.zeros(m)
+        self.sum_xu = np.zeros(m)
+        self.options = np.zeros((m, OPTION_SLOTS), dtype=np.int64)
+
+    # ----------------------------------
+    # Fold in a ResponseMatrix (attempts in ascending id order)
+    # ----------------------------------
+    def add_matrix(self, matrix):
+        if len(matrix) == 0:
+            return
+
+        codes = matrix.codes
+        _, correct = correctness_matrix(matrix)
+        x = correct.astype(np.float64)
+        u = x.sum(axis=1)
+
+        self.n += len(matrix)
+        self.last_attempt_id = max(self.last_attempt_id, matrix.attempt_ids[-1])
+        self.sum_u += float(u.sum())
+        self.sum_uu += float(u @ u)
+        self.sum_x += x.sum(axis=0)
+        self.sum_xu += x.T @ u
+
+        slots = np.minimum(codes, OPTION_SLOTS - 1)
+        for j, item in enumerate(matrix.key.items):
+            if item.type in FIXED_VOCABULARIES:
+                self.options[j] += np.bincount(slots[:, j], minlength=OPTION_SLOTS)
+
+    # ----------------------------------
+    # Per-item statistics + KR-20
+    # ----------------------------------
+    def report(self, key):
+        n = self.n
+        k = len(self.qids)
+        items = []
+
+        if n == 0 or k == 0:
+            return {"attempts": n, "items": items, "kr20": None, "mean": None, "stdev": None}
+
+        p = self.sum_x / n
+
+        # Rest score r = u - x:  Σr = Σu - Σx,  Σr² = Σu² - 2Σxu + Σx,  Σxr = Σxu - Σx
+        sum_r = self.sum_u - self.sum_x
+        sum_rr = self.sum_uu - 2 * self.sum_xu + self.sum_x
+        sum_xr = self.sum_xu - self.sum_x
+
+        cov = n * sum_xr - self.sum_x * sum_r
+        var_x = n * self.sum_x - self.sum_x ** 2
+        var_r = n * sum_rr - sum_r ** 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_pb = np.where((var_x > 0) & (var_r > 0), cov / np.sqrt(var_x * var_r), np.nan)
+
+        mean_u = self.sum_u / n
+        var_u = self.sum_uu / n - mean_u ** 2
+        kr20 = None
+        if k > 1 and var_u > 0:
+            kr20 = k / (k - 1) * (1 - float((p * (1 - p)).sum()) / var_u)
+
+        by_qid = {item.qid: item for item in key.items}
+        for j, qid in enumerate(self.qids):
+            item = by_qid[qid]
+            items.append({
+                "qid": qid,
+                "type": item.type,
+                "points": item.points,
+                "p_value": round(float(p[j]), 3),
+                "point_biserial": None if np.isnan(r_pb[j]) else round(float(r_pb[j]), 3),
+                "options": self._options(j, item),
+            })
+
+        return {
+            "attempts": n,
+            "items": items,
+            "kr20": None if kr20 is None else round(kr20, 3),
+            "mean": round(mean_u, 2),
+            "stdev": round(max(var_u, 0) ** 0.5, 2),
+        }
+
+    def _options(self, j, item):
+        vocabulary = FIXED_VOCABULARIES.get(item.type)
+        if vocabulary is None:
+            return None
+
+        counts = self.options[j]
+        labels = ["(blank)"] + [v.upper() if len(v) == 1 else v.capitalize() for v in vocabulary]
+        slots = list(range(len(vocabulary) + 1))
+        if counts[OPTION_SLOTS - 1]:
+            labels.append("(other)")
+            slots.append(OPTION_SLOTS - 1)
+
+        return [
+            {
+                "label": label,
+                "count": int(counts[slot]),
+                "share": round(int(counts[slot]) / self.n, 3),
+                "correct": slot > 0 and slot <= len(vocabulary) and vocabulary[slot - 1] == item.correct,
+            }
+            for label, slot in zip(labels, slots)
+        ]
+
+    # ----------------------------------
+    # Persisted as JSON so the next report starts from these sums
+    # ----------------------------------
+    def to_json(self):
+        return json.dumps({
+            "qids": self.qids,
+            "n": self.n,
+            "last_attempt_id": self.last_attempt_id,
+            "sum_u": self.sum_u,
+            "sum_uu": self.sum_uu,
+            "sum_x": self.sum_x.tolist(),
+            "sum_xu": self.sum_xu.tolist(),
+            "options": self.options.tolist(),
+        })
+
+    @classmethod
+    def from_json(cls, payload):
+        data = json.loads(payload)
+        stats = cls(data["qids"])
+        stats.n = data["n"]
+        stats.last_attempt_id = data["last_attempt_id"]
+        stats.sum_u = data["sum_u"]
+        stats.sum_uu = data["sum_uu"]
+        stats.sum_x = np.array(data["sum_x"], dtype=np.float64)
+        stats.sum_xu = np.array(data["sum_xu"], dtype=np.float64)
+        stats.options = np.array(data["options"], dtype=np.int64).reshape(len(stats.qids), OPTION_SLOTS)
+        return stats
@@ -0,0 +1,235 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — MEDIA STORE
+# Content-addressed question images with pre-sized variants
+# =========================================
+#
+# An upload is named by the SHA-256 of its bytes, never by the client's
+# filename: two teachers uploading "cell.png" no longer overwrite each
+# other, and the same photo uploaded twice is stored once.
+#
+#   <root>/ab/ab12…ef.png          original, as uploaded
+#   <root>/ab/ab12…ef_960.webp     variant, at most 960px wide
+#
+# Variants are made once, at upload, so students download a compressed
+# image sized for the page instead of the camera original. A name never
+# changes content, so /media/<name> can be cached by browsers forever.
+#
+# Variants need Pillow, imported on the first upload rather than at app
+# start. Without it only the original is stored and served, which still
+# gets the dedup and the caching.
+
+import hashlib
+import os
+import re
+import tempfile
+
+Image = ImageOps = features = None
+_pillow_loaded = False
+
+
+MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+MAX_PIXELS = 40_000_000
+
+# Variant widths; the 960px one is what the exam page loads by default
+VARIANT_WIDTHS = (480, 960, 1600)
+DISPLAY_WIDTH = 960
+QUALITY = 80
+
+NAME_RE = re.compile(r"^[0-9a-f]{64}(_\d+)?\.(png|jpg|gif|webp)$")
+
+MIME_TYPES = {"png": "image/png", "jpg": "image/jpeg", "gif": "image/gif", "webp": "image/webp"}
+
+
+# ----------------------------------
+# File type from the first bytes (the client's filename and
+# Content-Type are not trusted)
+# ----------------------------------
+def sniff(head):
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def variants_supported():
+    global Image, ImageOps, features, _pillow_loaded
+    if not _pillow_loaded:
+        try:
+            from PIL import Image, ImageOps, features
+        except ImportError:
+            pass
+        _pillow_loaded = True
+    return Image is not None
+
+
+def _variant_format():
+    return "webp" if features.check("webp") else "jpg"
+
+
+class MediaStore:
+
+    def __init__(self, root, widths=VARIANT_WIDTHS, quality=QUALITY):
+        self.root = root
+        self.widths = widths
+        self.quality = quality
+
+    def path(self, name):
+        return os.path.join(self.root, name[:2], name)
+
+    def exists(self, name):
+        return os.path.exists(self.path(name))
+
+    # ----------------------------------
+    # Store an upload; returns a dict describing it (see _describe).
+    # Raises ValueError for anything that is not an image we accept.
+    # ----------------------------------
+    def put(self, stream, max_bytes=MAX_UPLOAD_BYTES):
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".upload")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                head = b""
+                while True:
+                    chunk = stream.read(64 * 1024)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ValueError(f"image is larger than {max_bytes // (1024 * 1024)} MB")
+                    if len(head) < 16:
+                        head += chunk[:16]
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            ext = sniff(head)
+            if ext is None:
+                raise ValueError("file is not a PNG, JPEG, GIF or WebP image")
+
+            name = f"{digest.hexdigest()}.{ext}"
+            target = self.path(name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+            # Check (and make variants of) the upload while it is still the
+            # temporary file: a damaged or oversized image never gets a name
+            # in the store
+            try:
+                info = self._describe(name, size, tmp)
+            except ValueError:
+                if not os.path.exists(target):
+                    self._remove_variants(name.split(".")[0])
+                raise
+
+            if os.path.exists(target):
+                os.remove(tmp)
+            else:
+                os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+        return info
+
+    def _remove_variants(self, sha):
+        folder = os.path.dirname(self.path(sha))
+        for entry in os.listdir(folder):
+            if entry.startswith(f"{sha}_"):
+                os.remove(os.path.join(folder, entry))
+
+    # source: the file holding the image (the upload, before it is stored)
+    def _describe(self, name, size, source):
+        info = {
+            "name": name,
+            "sha256": name.split(".")[0],
+            "mime": MIME_TYPES[name.rsplit(".", 1)[1]],
+            "size": size,
+            "width": None,
+            "height": None,
+            "variants": [],
+        }
+        if not variants_supported():
+            return info
+
+        try:
+            with Image.open(source) as image:
+                width, height = image.size
+                if width * height > MAX_PIXELS:
+                    raise ValueError(f"image is too large ({width}×{height} pixels)")
+                info["width"], info["height"] = width, height
+
+                # Animated GIFs would lose their animation; keep them as they are
+                if getattr(image, "is_animated", False):
+                    return info
+
+                image = ImageOps.exif_transpose(image)
+                info["width"], info["height"] = image.size
+                info["variants"] = self._make_variants(info["sha256"], image)
+        except (OSError, Image.DecompressionBombError):
+            raise ValueError("image file is damaged or cannot be read")
+
+        return info
+
+    # ----------------------------------
+    # One variant per width, never wider than the original; a variant
+    # file that already exists (same upload seen before) is reused.
+    # Returns [[width, name], ...] narrowest first.
+    # ----------------------------------
+    def _make_variants(self, sha, image):
+        fmt = _variant_format()
+        variants = []
+
+        for width in sorted({min(w, image.width) for w in self.widths}):
+            name = f"{sha}_{width}.{fmt}"
+            variants.append([width, name])
+            if self.exists(name):
+                continue
+
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            if fmt == "jpg":
+                resized = self._flatten(resized)
+            elif resized.mode not in ("RGB", "RGBA"):
+                resized = resized.convert("RGBA" if "transparency" in resized.info else "RGB")
+
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".variant")
+            with os.fdopen(fd, "wb") as out:
+                resized.save(out, "WEBP" if fmt == "webp" else "JPEG",
+                             quality=self.quality, optimize=fmt == "jpg")
+            os.replace(tmp, self.path(name))
+
+        return variants
+
+    @staticmethod
+    def _flatten(image):
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            return background
+        return image.convert("RGB")
+
+
+# ----------------------------------
+# src / srcset for an <img>, from the stored description
+# ----------------------------------
+def image_sources(name, variants):
+    if not variants:
+        return {"src": f"/media/{name}", "srcset": None}
+
+    default = variants[0][1]
+    for width, variant in variants:
+        if width <= DISPLAY_WIDTH:
+            default = variant
+
+    return {
+        "src": f"/media/{default}",
+        "srcset": ", ".join(f"/media/{variant} {width}w" for width, variant in variants),
+    }
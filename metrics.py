@@ -0,0 +1,174 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — METRICS
+# Per-route latency histograms, SQL and template timing, Prometheus text
+# =========================================
+#
+# Everything is recorded into fixed-bucket histograms guarded by one lock,
+# so the per-request cost is a few dict lookups and additions. Per-request
+# state (query count/time, template time) lives on flask.g.
+
+import logging
+import threading
+import time
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+
+
+# Seconds; the same buckets are used for requests, queries and templates
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+slow_log = logging.getLogger("exam.slow_requests")
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = 0
+        while i < len(BUCKETS) and value > BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_seconds = {}   # (endpoint, method, status class) -> Histogram
+        self.sql_seconds = {}       # endpoint -> Histogram of time in SQL per request
+        self.sql_queries = {}       # endpoint -> total number of queries
+        self.template_seconds = {}  # template name -> Histogram
+        self.startup = None         # app.startup_report(), set by create_app()
+
+    def _observe(self, table, key, value):
+        with self._lock:
+            histogram = table.get(key)
+            if histogram is None:
+                histogram = table[key] = Histogram()
+            histogram.observe(value)
+
+    def observe_request(self, endpoint, method, status, seconds, sql_count, sql_seconds):
+        self._observe(self.request_seconds, (endpoint, method, f"{status // 100}xx"), seconds)
+        self._observe(self.sql_seconds, endpoint, sql_seconds)
+        with self._lock:
+            self.sql_queries[endpoint] = self.sql_queries.get(endpoint, 0) + sql_count
+
+    def observe_template(self, name, seconds):
+        self._observe(self.template_seconds, name, seconds)
+
+    # ----------------------------------
+    # Prometheus text exposition format (0.0.4)
+    # ----------------------------------
+    def render(self):
+        lines = []
+
+        def histogram(name, help_text, table, label_names):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, h in sorted(table.items()):
+                key = key if isinstance(key, tuple) else (key,)
+                labels = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(label_names, key))
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {h.total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+        with self._lock:
+            histogram("exam_request_duration_seconds", "Request latency by route.",
+                      self.request_seconds, ("endpoint", "method", "status"))
+            histogram("exam_request_sql_seconds", "Time spent in SQL per request.",
+                      self.sql_seconds, ("endpoint",))
+            histogram("exam_template_render_seconds", "Jinja template render time.",
+                      self.template_seconds, ("template",))
+
+            if self.startup:
+                lines.append("# HELP exam_boot_seconds Seconds from importing app.py to create_app() returning.")
+                lines.append("# TYPE exam_boot_seconds gauge")
+                lines.append(f"exam_boot_seconds {self.startup['boot_seconds']}")
+                lines.append("# HELP exam_boot_sql_statements SQL statements run while booting.")
+                lines.append("# TYPE exam_boot_sql_statements gauge")
+                lines.append(f"exam_boot_sql_statements {self.startup['sql_statements']}")
+
+            lines.append("# HELP exam_sql_queries_total SQL statements executed, by route.")
+            lines.append("# TYPE exam_sql_queries_total counter")
+            for endpoint, count in sorted(self.sql_queries.items()):
+                lines.append(f'exam_sql_queries_total{{endpoint="{_escape(endpoint)}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ----------------------------------
+# Wire the hooks into a Flask app + SQLAlchemy engine
+# ----------------------------------
+def init_metrics(app, engine, metrics):
+    slow_seconds = app.config.get("SLOW_REQUEST_SECONDS")
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+        g.sql_count = 0
+        g.sql_seconds = 0.0
+        g.sql_log = [] if slow_seconds else None
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return response
+
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or "unknown"
+        metrics.observe_request(endpoint, request.method, response.status_code,
+                                elapsed, g.sql_count, g.sql_seconds)
+
+        if slow_seconds and elapsed >= slow_seconds:
+            slow_log.warning(
+                "slow request %s %s %.3fs (%d queries, %.3fs in SQL)\n%s",
+                request.method, request.path, elapsed, g.sql_count, g.sql_seconds,
+                "\n".join(f"  {t * 1000:8.2f} ms  {sql}" for sql, t in g.sql_log)
+            )
+        return response
+
+    # One start time per connection: a connection runs one statement at a
+    # time, and a statement that fails (no after_cursor_execute) leaves
+    # nothing behind but a value the next statement overwrites
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_query(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop("query_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        if not has_request_context() or "sql_count" not in g:
+            return
+        g.sql_count += 1
+        g.sql_seconds += elapsed
+        if g.sql_log is not None:
+            g.sql_log.append((" ".join(statement.split()), elapsed))
+
+    @before_render_template.connect_via(app)
+    def _template_start(sender, template, context, **extra):
+        g.setdefault("template_starts", []).append(time.perf_counter())
+
+    @template_rendered.connect_via(app)
+    def _template_done(sender, template, context, **extra):
+        starts = g.get("template_starts")
+        if starts:
+            metrics.observe_template(template.name or "string", time.perf_counter() - starts.pop())
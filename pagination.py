@@ -0,0 +1,129 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — KEYSET PAGINATION
+# Cursor-based pages for the admin / teacher listings
+# =========================================
+#
+# OFFSET pagination reads and throws away every row before the page, so
+# page 500 of the attempts table costs 500 pages of work. Here a page is
+# "the next N rows after the last one you saw": the cursor carries the
+# sort key of the last row (e.g. (date, id)), and the query continues
+# with WHERE (date, id) < (:date, :id) ORDER BY date DESC, id DESC, which
+# an index answers directly. Every page costs the same however deep it is.
+#
+# Cursors are opaque URL-safe strings; a broken or stale one just gives
+# the first page.
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 200
+
+
+# ----------------------------------
+# One allowed ordering: all columns in the same direction, the last one
+# unique (normally the primary key) so the order is total. Sorting on an
+# expression (a cast) needs key, row -> the cursor values.
+# ----------------------------------
+class Sort:
+
+    def __init__(self, *columns, descending=False, key=None):
+        self.columns = columns
+        self.descending = descending
+        self.key = key
+
+    def order_by(self):
+        return [c.desc() if self.descending else c.asc() for c in self.columns]
+
+    def after(self, values):
+        key = tuple_(*self.columns)
+        bound = tuple_(*values)
+        return key < bound if self.descending else key > bound
+
+    def key_of(self, row):
+        if self.key is not None:
+            return self.key(row)
+        return [getattr(row, c.key) for c in self.columns]
+
+
+class Page:
+
+    def __init__(self, items, next_cursor, per_page, sort):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.per_page = per_page
+        self.sort = sort
+
+    @property
+    def has_more(self):
+        return self.next_cursor is not None
+
+    def to_json(self, serialize):
+        return {
+            "items": [serialize(item) for item in self.items],
+            "next_cursor": self.next_cursor,
+            "has_more": self.has_more,
+            "per_page": self.per_page,
+            "sort": self.sort,
+        }
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, size):
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = [_decode_value(v) for v in json.loads(raw)]
+    except (ValueError, TypeError):
+        return None
+    return values if len(values) == size else None
+
+
+def per_page_arg(value, default=DEFAULT_PER_PAGE):
+    try:
+        return max(1, min(int(value), MAX_PER_PAGE))
+    except (TypeError, ValueError):
+        return default
+
+
+# ----------------------------------
+# Run `query` for one page. sorts maps the names a client may ask for
+# (?sort=...) to Sort objects; the first one is the default.
+# ----------------------------------
+def keyset_page(query, sorts, sort=None, cursor=None, per_page=DEFAULT_PER_PAGE):
+    name = sort if sort in sorts else next(iter(sorts))
+    order = sorts[name]
+
+    values = decode_cursor(cursor, len(order.columns))
+    if values is not None:
+        query = query.filter(order.after(values))
+
+    rows = query.order_by(*order.order_by()).limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page:
+        next_cursor = encode_cursor(order.key_of(items[-1]))
+
+    return Page(items, next_cursor, per_page, name)
@@ -0,0 +1,171 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — QUESTION SEARCH
+# SQLite FTS5 index over the question bank, ranked with bm25
+# =========================================
+#
+# question_fts is an external-content FTS5 table: it stores only the index,
+# the text stays in `question`. Triggers on `question` keep it in sync for
+# every write path (add_question, import_excel's bulk inserts, edits,
+# deletes), so no route has to remember to re-index.
+#
+# On other databases search() falls back to a LIKE scan so the API still
+# works, just without ranking.
+
+import re
+
+from sqlalchemy import text
+
+
+INDEXED_COLUMNS = (
+    "question_text", "option_a", "option_b", "option_c", "option_d",
+    "correct_answer", "fill_answers", "match_pairs",
+)
+
+# bm25 weights, same order as INDEXED_COLUMNS: the question text counts most
+WEIGHTS = (10.0, 2.0, 2.0, 2.0, 2.0, 3.0, 3.0, 3.0)
+
+MAX_PER_PAGE = 100
+
+_columns = ", ".join(INDEXED_COLUMNS)
+_new = ", ".join(f"new.{c}" for c in INDEXED_COLUMNS)
+_old = ", ".join(f"old.{c}" for c in INDEXED_COLUMNS)
+
+SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS question_fts USING fts5(
+        {_columns}, content='question', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    f"""CREATE TRIGGER IF NOT EXISTS question_fts_insert AFTER INSERT ON question BEGIN
+        INSERT INTO question_fts(rowid, {_columns}) VALUES (new.id, {_new});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS question_fts_delete AFTER DELETE ON question BEGIN
+        INSERT INTO question_fts(question_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS question_fts_update AFTER UPDATE ON question BEGIN
+        INSERT INTO question_fts(question_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old});
+        INSERT INTO question_fts(rowid, {_columns}) VALUES (new.id, {_new});
+    END""",
+]
+
+
+def is_supported(engine):
+    return engine.dialect.name == "sqlite"
+
+
+# ----------------------------------
+# Create the index + triggers if missing; fill it the first time.
+# Returns True when the index was (re)built.
+# ----------------------------------
+def ensure_index(engine):
+    if not is_supported(engine):
+        return False
+
+    with engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'question_fts'"
+        )).first()
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text("INSERT INTO question_fts(question_fts) VALUES ('rebuild')"))
+
+    return not exists
+
+
+def rebuild_index(engine):
+    with engine.begin() as conn:
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text("INSERT INTO question_fts(question_fts) VALUES ('rebuild')"))
+        conn.execute(text("INSERT INTO question_fts(question_fts) VALUES ('optimize')"))
+
+
+# ----------------------------------
+# Free text -> FTS5 query: every word must match, as a prefix of a
+# token ("mito" finds "mitochondria"). Operators typed by the user are
+# treated as plain words.
+# ----------------------------------
+def to_match_query(query):
+    words = re.findall(r"\w+", query or "")
+    return " ".join(f'"{word}"*' for word in words[:20])
+
+
+def _filters(filters, params):
+    clauses = []
+    if filters.get("type"):
+        clauses.append("q.type = :type")
+        params["type"] = filters["type"]
+    if filters.get("exam_id"):
+        clauses.append("q.exam_id = :exam_id")
+        params["exam_id"] = filters["exam_id"]
+    if filters.get("grade_id"):
+        clauses.append("e.grade_id = :grade_id")
+        params["grade_id"] = filters["grade_id"]
+    return "".join(f" AND {c}" for c in clauses)
+
+
+# ----------------------------------
+# Returns (rows, has_more). Rows are mappings with the question columns
+# plus exam_title, grade_id and rank (lower = better).
+# ----------------------------------
+def search(session, query, filters=None, page=1, per_page=20):
+    filters = filters or {}
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    page = max(1, page)
+
+    params = {"limit": per_page + 1, "offset": (page - 1) * per_page}
+    where = _filters(filters, params)
+    select = """q.id, q.exam_id, q.type, q.question_text, q.option_a, q.option_b,
+                q.option_c, q.option_d, q.correct_answer, q.fill_answers,
+                q.match_pairs, q.points, e.title AS exam_title, e.grade_id"""
+
+    match = to_match_query(query)
+    if not match:
+        return [], False
+
+    if is_supported(session.get_bind()):
+        params["match"] = match
+        weights = ", ".join(str(w) for w in WEIGHTS)
+        if where:
+            sql = f"""
+                SELECT {select}, bm25(question_fts, {weights}) AS rank
+                FROM question_fts
+                JOIN question q ON q.id = question_fts.rowid
+                JOIN exam e ON e.id = q.exam_id
+                WHERE question_fts MATCH :match{where}
+                ORDER BY rank, q.id
+                LIMIT :limit OFFSET :offset
+            """
+        else:
+            # Unfiltered: rank and cut inside the index, join only one page
+            sql = f"""
+                SELECT {select}, f.rank
+                FROM (
+                    SELECT rowid, bm25(question_fts, {weights}) AS rank
+                    FROM question_fts
+                    WHERE question_fts MATCH :match
+                    ORDER BY rank, rowid
+                    LIMIT :limit OFFSET :offset
+                ) f
+                JOIN question q ON q.id = f.rowid
+                JOIN exam e ON e.id = q.exam_id
+                ORDER BY f.rank, q.id
+            """
+    else:
+        terms = re.findall(r"\w+", query)[:20]
+        likes = []
+        for i, term in enumerate(terms):
+            params[f"term{i}"] = f"%{term.lower()}%"
+            likes.append("(" + " OR ".join(
+                f"LOWER(COALESCE(q.{c}, '')) LIKE :term{i}" for c in INDEXED_COLUMNS
+            ) + ")")
+        sql = f"""
+            SELECT {select}, 0 AS rank
+            FROM question q
+            JOIN exam e ON e.id = q.exam_id
+            WHERE {" AND ".join(likes)}{where}
+            ORDER BY q.id DESC
+            LIMIT :limit OFFSET :offset
+        """
+
+    rows = session.execute(text(sql), params).mappings().all()
+    return rows[:per_page], len(rows) > per_page
@@ -0,0 +1,145 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — RE-GRADING ENGINE
+# Response matrix (attempt x question) + one NumPy scoring pass
+# =========================================
+#
+# Every cell of the matrix is a small integer code: 0 means "not answered",
+# anything else indexes the column's vocabulary of distinct normalized
+# answers. MCQ and TF columns start with a fixed vocabulary (A-D, True/False)
+# so their codes are stable; free-text columns are dictionary-encoded as
+# answers are added. Correctness is decided once per distinct answer, not
+# once per attempt, and the whole exam is then scored with array lookups.
+
+import numpy as np
+
+from answer_key import normalize
+from response_store import decode_codes, decode_raw
+
+
+FIXED_VOCABULARIES = {
+    "MCQ": ("a", "b", "c", "d"),
+    "TF": ("true", "false"),
+}
+
+
+def normalize_answer(item, answer):
+    if item.type == "Match":
+        return tuple(normalize(p) for p in answer)
+    return normalize(answer)
+
+
+class ResponseMatrix:
+
+    def __init__(self, key, capacity=1024):
+        self.key = key
+        self.columns = {item.qid: j for j, item in enumerate(key.items)}
+        self.vocabularies = [
+            {value: code for code, value in enumerate(FIXED_VOCABULARIES.get(item.type, ()), start=1)}
+            for item in key.items
+        ]
+        # Raw answer as stored (or as packed) -> code, so each distinct
+        # spelling is decoded and normalized once, not once per attempt
+        self._raw_codes = [{} for _ in key.items]
+        self.attempt_ids = []
+        self._codes = np.zeros((max(capacity, 1), len(key.items)), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.attempt_ids)
+
+    def _code(self, j, answer):
+        code = self._raw_codes[j].get(answer)
+        if code is None:
+            value = normalize_answer(self.key.items[j], answer)
+            vocabulary = self.vocabularies[j]
+            code = vocabulary.get(value)
+            if code is None:
+                code = vocabulary[value] = len(vocabulary) + 1
+            self._raw_codes[j][answer] = code
+        return code
+
+    def _packed_code(self, j, raw):
+        answer = decode_raw(raw)
+        code = self._code(j, answer) if answer else 0
+        self._raw_codes[j][raw] = code
+        return code
+
+    # Rows are written in place; the array doubles when it is full
+    def _append(self, attempt_id, row):
+        n = len(self.attempt_ids)
+        if n == len(self._codes):
+            grown = np.zeros((2 * n, self._codes.shape[1]), dtype=np.int32)
+            grown[:n] = self._codes
+            self._codes = grown
+        self._codes[n] = row
+        self.attempt_ids.append(attempt_id)
+
+    # ----------------------------------
+    # Add one attempt's answers ({question_id: answer})
+    # ----------------------------------
+    def add(self, attempt_id, answers):
+        row = [0] * len(self.key.items)
+        columns = self.columns
+
+        for qid, answer in answers.items():
+            j = columns.get(qid)
+            if j is None or not answer:
+                continue
+            row[j] = self._code(j, answer)
+
+        self._append(attempt_id, row)
+
+    # ----------------------------------
+    # Add one attempt from its response_store row, decoded straight into
+    # codes
+    # ----------------------------------
+    def add_packed(self, attempt_id, data):
+        row = decode_codes(data, self.columns, self._raw_codes, self._packed_code,
+                           [0] * len(self.key.items))
+        self._append(attempt_id, row)
+
+    @property
+    def codes(self):
+        return self._codes[:len(self.attempt_ids)]
+
+
+# ----------------------------------
+# (answered, correct) boolean arrays, attempt x question
+# ----------------------------------
+def correctness_matrix(matrix):
+    key = matrix.key
+    codes = matrix.codes
+
+    if codes.size == 0:
+        return codes > 0, np.zeros(codes.shape, dtype=bool)
+
+    # Flattened per-column lookup tables: correct[offsets[j] + code]
+    sizes = np.array([len(v) + 1 for v in matrix.vocabularies], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    correct_table = np.zeros(int(sizes.sum()), dtype=bool)
+
+    for j, item in enumerate(key.items):
+        for value, code in matrix.vocabularies[j].items():
+            correct_table[offsets[j] + code] = key.is_correct(item, value)
+
+    return codes > 0, correct_table[codes + offsets]
+
+
+# ----------------------------------
+# Score every attempt in the matrix against its answer key.
+# Returns a float array aligned with matrix.attempt_ids.
+# ----------------------------------
+def score_matrix(matrix):
+    key = matrix.key
+    n, m = matrix.codes.shape
+
+    if n == 0 or m == 0:
+        return np.zeros(n, dtype=np.float64)
+
+    points = np.array([item.points for item in key.items], dtype=np.float64)
+    penalized = np.array([item.penalized for item in key.items], dtype=bool)
+
+    answered, correct = correctness_matrix(matrix)
+    wrong = answered & ~correct & penalized
+
+    scores = correct @ points - wrong.sum(axis=1) * float(key.negative)
+    return np.maximum(scores, 0)
@@ -0,0 +1,72 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — RENDERED FRAGMENT CACHE
+# Size-bounded LRU of rendered exam question bodies
+# =========================================
+#
+# Keys are (exam_id, version). The rendered question list is the same for
+# every student who gets that version, so it is rendered once and reused;
+# only the small per-student wrapper is rendered per request.
+
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, render):
+        exam_id = key[0]
+
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+            generation = (self._epoch, self._generations.get(exam_id, 0))
+
+        html = render()
+
+        with self._lock:
+            # Dropped while rendering -> serve it, but don't keep it
+            current = (self._epoch, self._generations.get(exam_id, 0))
+            if current == generation and key not in self._entries:
+                self._entries[key] = html
+                self._bytes += len(html)
+                self._evict()
+
+        return html
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, html = self._entries.popitem(last=False)
+            self._bytes -= len(html)
+
+    # ----------------------------------
+    # Drop every cached version of one exam (or everything)
+    # ----------------------------------
+    def invalidate(self, exam_id=None):
+        with self._lock:
+            if exam_id is None:
+                self._epoch += 1
+                self._entries.clear()
+                self._bytes = 0
+                return
+
+            self._generations[exam_id] = self._generations.get(exam_id, 0) + 1
+            for key in [k for k in self._entries if k[0] == exam_id]:
+                self._bytes -= len(self._entries.pop(key))
@@ -0,0 +1,254 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — RESPONSE STORE
+# Compact binary encoding of per-question answers (one row per attempt)
+# =========================================
+#
+# Row layout (all integers are unsigned LEB128 varints):
+#
+#   FORMAT_VERSION
+#   repeated, in ascending question id order:
+#       question id delta (from the previous question id)
+#       tag
+#       payload (depends on tag)
+#
+# Tags 1-6 stand for the common fixed answers (MCQ letters, True/False) and
+# carry no payload, so a 50-question MCQ attempt packs into ~100 bytes.
+# TAG_TEXT carries one UTF-8 string, TAG_PARTS a list of them (Match).
+
+FORMAT_VERSION = 1
+
+TOKENS = ("A", "B", "C", "D", "True", "False")
+TOKEN_TAGS = {token: tag for tag, token in enumerate(TOKENS, start=1)}
+
+TAG_TEXT = 0x10
+TAG_PARTS = 0x11
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _write_text(out, text):
+    raw = text.encode("utf-8")
+    _write_varint(out, len(raw))
+    out += raw
+
+
+def _read_text(data, pos):
+    size, pos = _read_varint(data, pos)
+    return data[pos:pos + size].decode("utf-8"), pos + size
+
+
+# ----------------------------------
+# {question_id: answer} -> bytes
+# ----------------------------------
+def pack_answers(answers):
+    out = bytearray([FORMAT_VERSION])
+    previous = 0
+
+    for qid in sorted(answers):
+        answer = answers[qid]
+        _write_varint(out, qid - previous)
+        previous = qid
+
+        if isinstance(answer, (tuple, list)):
+            out.append(TAG_PARTS)
+            _write_varint(out, len(answer))
+            for part in answer:
+                _write_text(out, part)
+        elif answer.strip() in TOKEN_TAGS:
+            out.append(TOKEN_TAGS[answer.strip()])
+        else:
+            out.append(TAG_TEXT)
+            _write_text(out, answer)
+
+    return bytes(out)
+
+
+# ----------------------------------
+# bytes -> (question_id, answer) pairs, in question id order
+# ----------------------------------
+def iter_answers(data):
+    if not data:
+        return
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unknown response format {data[0]}")
+
+    qid = 0
+    pos = 1
+    end = len(data)
+
+    while pos < end:
+        byte = data[pos]
+        if byte < 0x80:
+            # One-byte delta: the usual case
+            qid += byte
+            pos += 1
+        else:
+            delta, pos = _read_varint(data, pos)
+            qid += delta
+        tag = data[pos]
+        pos += 1
+
+        if tag == TAG_TEXT:
+            answer, pos = _read_text(data, pos)
+        elif tag == TAG_PARTS:
+            count, pos = _read_varint(data, pos)
+            parts = []
+            for _ in range(count):
+                part, pos = _read_text(data, pos)
+                parts.append(part)
+            answer = tuple(parts)
+        else:
+            answer = TOKENS[tag - 1]
+
+        yield qid, answer
+
+
+# ----------------------------------
+# bytes -> {question_id: answer}
+# ----------------------------------
+def unpack_answers(data):
+    return dict(iter_answers(data))
+
+
+# ----------------------------------
+# A stored answer exactly as packed: the tag for a fixed token, the raw
+# payload bytes for text and Match parts. Equal answers pack equal, so
+# this is a cheap dictionary key for one.
+# ----------------------------------
+def decode_raw(raw):
+    if isinstance(raw, int):
+        return TOKENS[raw - 1]
+    tag, pos = raw[0], 1
+    if tag == TAG_TEXT:
+        return _read_text(raw, pos)[0]
+    count, pos = _read_varint(raw, pos)
+    parts = []
+    for _ in range(count):
+        part, pos = _read_text(raw, pos)
+        parts.append(part)
+    return tuple(parts)
+
+
+# ----------------------------------
+# Decode one packed row straight into integer codes, without building the
+# answers: row[columns[qid]] = caches[j][raw], and miss(j, raw) fills in a
+# raw answer the column has not seen yet. Question ids not in columns
+# are skipped.
+# ----------------------------------
+def decode_codes(data, columns, caches, miss, row):
+    if not data:
+        return row
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unknown response format {data[0]}")
+
+    qid = 0
+    pos = 1
+    end = len(data)
+
+    while pos < end:
+        byte = data[pos]
+        if byte < 0x80:
+            qid += byte
+            pos += 1
+        else:
+            delta, pos = _read_varint(data, pos)
+            qid += delta
+        tag = data[pos]
+
+        if tag == TAG_TEXT:
+            start = pos
+            size, pos = _read_varint(data, pos + 1)
+            pos += size
+            raw = data[start:pos]
+        elif tag == TAG_PARTS:
+            start = pos
+            count, pos = _read_varint(data, pos + 1)
+            for _ in range(count):
+                size, pos = _read_varint(data, pos)
+                pos += size
+            raw = data[start:pos]
+        else:
+            pos += 1
+            raw = tag
+
+        j = columns.get(qid)
+        if j is None:
+            continue
+        code = caches[j].get(raw)
+        if code is None:
+            code = miss(j, raw)
+        row[j] = code
+
+    return row
+
+
+# ----------------------------------
+# BULK INSERT — rows are dicts of
+# {"attempt_id", "exam_id", "answers"}
+# ----------------------------------
+def bulk_insert(session, model, rows, chunk_size=1000):
+    table = model.__table__
+    chunk = []
+    count = 0
+
+    for row in rows:
+        chunk.append({
+            "attempt_id": row["attempt_id"],
+            "exam_id": row["exam_id"],
+            "data": pack_answers(row["answers"]),
+        })
+        if len(chunk) >= chunk_size:
+            session.execute(table.insert(), chunk)
+            count += len(chunk)
+            chunk = []
+
+    if chunk:
+        session.execute(table.insert(), chunk)
+        count += len(chunk)
+
+    return count
+
+
+# ----------------------------------
+# STREAMING READER — yields (attempt_id, answers) for one exam.
+# Reads in keyset batches on attempt_id so memory stays flat and no
+# long-running cursor holds the database.
+# ----------------------------------
+def stream_answers(session, model, exam_id, batch_size=2000, after_id=0):
+    for attempt_id, data in stream_packed(session, model, exam_id, batch_size, after_id):
+        yield attempt_id, unpack_answers(data)
+
+
+# Same, but (attempt_id, packed bytes): for readers that decode themselves
+def stream_packed(session, model, exam_id, batch_size=2000, after_id=0):
+    last_id = after_id
+
+    while True:
+        batch = session.query(model.attempt_id, model.data) \
+                       .filter(model.exam_id == exam_id, model.attempt_id > last_id) \
+                       .order_by(model.attempt_id) \
+                       .limit(batch_size) \
+                       .all()
+        if not batch:
+            return
+
+        yield from batch
+
+        last_id = batch[-1][0]
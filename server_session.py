@@ -0,0 +1,97 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — SERVER-SIDE SESSIONS
+# Session data in a shared backend; the cookie only carries an id
+# =========================================
+#
+# With Flask's default cookie session any node can read a session, but
+# the data lives in the browser: it cannot be revoked, and it grows with
+# every key. Here the cookie holds a random id and the data is kept in a
+# shared_cache backend (SQLBackend on the main database for several
+# nodes), so any node can serve any request.
+#
+# Ids are only ever generated by the server: an unknown id from the
+# client starts a new, empty session under a fresh id.
+
+import re
+import secrets
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+SID_RE = re.compile(r"^[A-Za-z0-9_-]{43}$")
+
+
+class ServerSession(CallbackDict, SessionMixin):
+
+    def __init__(self, initial=None, sid=None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.modified = False
+        self.accessed = False
+
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+
+class BackendSessionInterface(SessionInterface):
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, backend, prefix="session:"):
+        self.backend = backend
+        self.prefix = prefix
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and SID_RE.match(sid):
+            raw = self.backend.get(self.prefix + sid)
+            if raw is not None:
+                return ServerSession(self.serializer.loads(raw.decode()), sid=sid)
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            if session.modified and session.sid:
+                self.backend.delete(self.prefix + session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(32)
+
+        if session.modified or session.permanent:
+            self.backend.set(self.prefix + session.sid,
+                             self.serializer.dumps(dict(session)).encode(),
+                             ttl=int(app.permanent_session_lifetime.total_seconds()))
+
+        response.vary.add("Cookie")
+        response.set_cookie(
+            name, session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
@@ -0,0 +1,297 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — SHARED CACHE
+# Pluggable key/value backends for caches shared across workers and nodes
+# =========================================
+#
+# The in-process caches (answer_key.ExamCache, render_cache.FragmentCache)
+# are per worker: invalidate_exam() on one node leaves every other node
+# grading with the old key. SharedExamCache / SharedFragmentCache are
+# drop-in replacements backed by a Backend that all nodes see:
+#
+#   - every exam has an invalidation counter in the backend; values are
+#     stored under "<namespace>:<generation>:<key>", so bumping the
+#     counter makes all old entries unreachable on every node at once
+#   - each worker keeps a small local copy and re-reads the counter at
+#     most every `generation_ttl` seconds, so a hot exam costs no backend
+#     round trip per request, and an edit reaches all nodes within that
+#
+# Backends:
+#   MemoryBackend   one process (tests, single worker)
+#   SQLBackend      a table in any SQLAlchemy database: a local SQLite
+#                   file shares it between the workers of one node, the
+#                   main PostgreSQL database between all nodes
+#
+# Values are pickled; the backend must only be writable by the app.
+
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import (Column, Float, Integer, LargeBinary, MetaData, String, Table,
+                        create_engine, delete, event, select)
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+DEFAULT_TTL = 24 * 3600
+GENERATION_TTL = 1.0
+
+
+class MemoryBackend:
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def counters(self, keys):
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+
+# ----------------------------------
+# One table, created on first use: (key, value, expires_at, counter).
+# Give it its own engine (see make_backend): sharing the app's pool
+# deadlocks once every pooled connection belongs to a request that is
+# waiting for one more.
+# ----------------------------------
+class SQLBackend:
+
+    PURGE_EVERY = 500
+
+    def __init__(self, engine, table_name="cache_entry"):
+        self.engine = engine
+        self._ready = False
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.table = Table(
+            table_name, MetaData(),
+            Column("key", String(255), primary_key=True),
+            Column("value", LargeBinary),
+            Column("expires_at", Float, index=True),
+            Column("counter", Integer, nullable=False, default=0),
+        )
+
+    def _connect(self):
+        engine = self.engine
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self.table.metadata.create_all(engine, checkfirst=True)
+                    self._ready = True
+        return engine
+
+    def _upsert(self, engine):
+        if engine.dialect.name == "postgresql":
+            return postgresql.insert(self.table)
+        return sqlite.insert(self.table)
+
+    def get(self, key):
+        engine = self._connect()
+        with engine.connect() as conn:
+            row = conn.execute(
+                select(self.table.c.value, self.table.c.expires_at).where(self.table.c.key == key)
+            ).first()
+        if row is None or row.value is None:
+            return None
+        if row.expires_at is not None and row.expires_at < time.time():
+            return None
+        return row.value
+
+    def set(self, key, value, ttl=None):
+        engine = self._connect()
+        expires_at = time.time() + ttl if ttl else None
+        stmt = self._upsert(engine).values(key=key, value=value, expires_at=expires_at, counter=0)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["key"], set_={"value": value, "expires_at": expires_at}
+        )
+        with engine.begin() as conn:
+            conn.execute(stmt)
+
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def delete(self, key):
+        engine = self._connect()
+        with engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.key == key))
+
+    def incr(self, key):
+        engine = self._connect()
+        stmt = self._upsert(engine).values(key=key, counter=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["key"], set_={"counter": self.table.c.counter + 1}
+        ).returning(self.table.c.counter)
+        with engine.begin() as conn:
+            return conn.execute(stmt).scalar_one()
+
+    def counters(self, keys):
+        engine = self._connect()
+        with engine.connect() as conn:
+            found = dict(conn.execute(
+                select(self.table.c.key, self.table.c.counter).where(self.table.c.key.in_(keys))
+            ).all())
+        return [found.get(key, 0) for key in keys]
+
+    def purge_expired(self):
+        engine = self._connect()
+        with engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.expires_at < time.time()))
+
+
+# ----------------------------------
+# "memory://"            MemoryBackend
+# any SQLAlchemy URL     SQLBackend on that database (no I/O until used)
+# ----------------------------------
+def make_backend(url, table_name="cache_entry"):
+    if not url or url == "memory://":
+        return MemoryBackend()
+
+    if not url.startswith("sqlite"):
+        return SQLBackend(create_engine(url, pool_pre_ping=True, pool_recycle=1800), table_name)
+
+    # Several worker processes write the same file: WAL + wait for locks
+    engine = create_engine(url, connect_args={"timeout": 10, "check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _wal(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA synchronous=NORMAL")
+
+    return SQLBackend(engine, table_name)
+
+
+# ----------------------------------
+# Per-exam invalidation counters, read through a short local memo
+# ----------------------------------
+class Generations:
+
+    def __init__(self, backend, ttl=GENERATION_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def current(self, exam_id):
+        now = time.monotonic()
+        memo = self._memo.get(exam_id)
+        if memo is not None and now - memo[1] < self.ttl:
+            return memo[0]
+
+        generation = tuple(self.backend.counters(["gen:all", f"gen:{exam_id}"]))
+        with self._lock:
+            self._memo[exam_id] = (generation, now)
+        return generation
+
+    def bump(self, exam_id=None):
+        self.backend.incr("gen:all" if exam_id is None else f"gen:{exam_id}")
+        with self._lock:
+            if exam_id is None:
+                self._memo.clear()
+            else:
+                self._memo.pop(exam_id, None)
+
+
+class SharedCache:
+
+    def __init__(self, backend, generations, namespace, ttl=DEFAULT_TTL, max_local=256):
+        self.backend = backend
+        self.generations = generations
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_local = max_local
+        self._local = OrderedDict()  # key -> (generation, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._local)
+
+    def _get(self, exam_id, key, load):
+        generation = self.generations.current(exam_id)
+
+        with self._lock:
+            local = self._local.get(key)
+            if local is not None and local[0] == generation:
+                self._local.move_to_end(key)
+                self.hits += 1
+                return local[1]
+
+        name = f"{self.namespace}:{generation[0]}.{generation[1]}:{key}"
+        raw = self.backend.get(name)
+        if raw is not None:
+            value = pickle.loads(raw)
+            self.hits += 1
+        else:
+            self.misses += 1
+            value = load()
+            if value is None:
+                return None
+            # Spread expiry so a deploy's worth of entries does not expire at once
+            self.backend.set(name, pickle.dumps(value), self.ttl * random.uniform(0.9, 1.0))
+
+        with self._lock:
+            self._local[key] = (generation, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local:
+                self._local.popitem(last=False)
+
+        return value
+
+    def invalidate(self, exam_id=None):
+        self.generations.bump(exam_id)
+        with self._lock:
+            if exam_id is None:
+                self._local.clear()
+            else:
+                for key in [k for k in self._local if self._exam_of(k) == exam_id]:
+                    del self._local[key]
+
+    @staticmethod
+    def _exam_of(key):
+        return key[0] if isinstance(key, tuple) else key
+
+
+# Drop-in for answer_key.ExamCache: get(exam_id, loader)
+class SharedExamCache(SharedCache):
+
+    def get(self, exam_id, loader):
+        return self._get(exam_id, exam_id, lambda: loader(exam_id))
+
+
+# Drop-in for render_cache.FragmentCache: get((exam_id, ...), render)
+class SharedFragmentCache(SharedCache):
+
+    def get(self, key, render):
+        return self._get(key[0], key, render)
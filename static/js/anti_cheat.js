@@ -1,10 +1,44 @@
 // ANTI CHEAT — Detect tab switching, auto-submit after violations
+//
+// Every event (tab hidden, window blur, paste) is also queued with its
+// time and sent to /api/violations in small batches for the proctor view.
 
 let violationCount = 0;
 const maxViolations = 3;
 
+let violationEvents = [];
+
+function recordViolation(type) {
+    violationEvents.push({ type: type, t: Date.now() });
+}
+
+function sendViolations(useBeacon) {
+    if (violationEvents.length === 0) return;
+
+    const body = JSON.stringify({ events: violationEvents });
+    violationEvents = [];
+
+    if (useBeacon && navigator.sendBeacon) {
+        navigator.sendBeacon("/api/violations", new Blob([body], { type: "application/json" }));
+        return;
+    }
+
+    fetch("/api/violations", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        credentials: "same-origin",
+        body: body
+    }).catch(() => {});
+}
+
+setInterval(() => sendViolations(false), 5000);
+window.addEventListener("pagehide", () => sendViolations(true));
+
 document.addEventListener("visibilitychange", () => {
     if (document.hidden) {
+        recordViolation("hidden");
+        sendViolations(true);
+
         violationCount++;
 
         const vInput = document.getElementById("violations");
@@ -19,6 +53,9 @@ document.addEventListener("visibilitychange", () => {
     }
 });
 
+window.addEventListener("blur", () => recordViolation("blur"));
+document.addEventListener("paste", () => recordViolation("paste"));
+
 // Warning before leaving exam page
 window.addEventListener("beforeunload", function(e) {
     return "Are you sure you want to leave the exam?";
@@ -0,0 +1,89 @@
+// AUTOSAVE.JS — Send changed answers to the server while the exam is open
+
+document.addEventListener("DOMContentLoaded", () => {
+    const form = document.getElementById("examForm");
+    if (!form) return;
+
+    const saved = {};    // field name -> value the server already has
+    let pending = {};    // field name -> value changed since the last save
+    let sending = false;
+
+    const isAnswer = (el) => el.name && el.name.startsWith("q_");
+
+    // Restore answers saved before a reload / dropped connection (once
+    // exam_paper.js has built the questions, when they come from the API)
+    const savedElement = document.getElementById("savedAnswers");
+    const restored = savedElement ? JSON.parse(savedElement.textContent) : {};
+
+    Promise.resolve(window.examPaperReady).then(() => {
+        for (const el of form.elements) {
+            if (!isAnswer(el) || !(el.name in restored)) continue;
+
+            if (el.type === "radio") {
+                el.checked = el.value === restored[el.name];
+            } else {
+                el.value = restored[el.name];
+            }
+            saved[el.name] = restored[el.name];
+        }
+    });
+
+    function remember(event) {
+        const el = event.target;
+        if (!isAnswer(el) || (el.type === "radio" && !el.checked)) return;
+        pending[el.name] = el.value;
+    }
+
+    form.addEventListener("change", remember);
+    form.addEventListener("input", remember);
+
+    function save() {
+        if (sending || Object.keys(pending).length === 0) return;
+
+        const batch = pending;
+        pending = {};
+        sending = true;
+
+        fetch("/autosave", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            credentials: "same-origin",
+            body: JSON.stringify({ answers: batch })
+        })
+            .then((response) => {
+                if (!response.ok) throw new Error(response.status);
+                Object.assign(saved, batch);
+            })
+            .catch(() => {
+                // Put the batch back unless the field changed again meanwhile
+                for (const name in batch) {
+                    if (!(name in pending)) pending[name] = batch[name];
+                }
+            })
+            .finally(() => { sending = false; });
+    }
+
+    setInterval(save, 3000);
+
+    // Last chance when the tab is hidden or closed
+    window.addEventListener("pagehide", () => {
+        if (Object.keys(pending).length === 0) return;
+        const body = new Blob([JSON.stringify({ answers: pending })], { type: "application/json" });
+        navigator.sendBeacon("/autosave", body);
+    });
+
+    // On submit, leave out answers the server already has — it fills them
+    // in from the autosaved draft, so the final POST stays small
+    form.addEventListener("submit", () => {
+        for (const el of form.elements) {
+            if (!isAnswer(el) || el.name in pending || !(el.name in saved)) continue;
+
+            if (el.type === "radio") {
+                const checked = form.querySelector(`input[name="${el.name}"]:checked`);
+                if (checked && checked.value === saved[el.name]) el.disabled = true;
+            } else if (el.value === saved[el.name]) {
+                el.disabled = true;
+            }
+        }
+    });
+});
@@ -0,0 +1,108 @@
+// EXAM_PAPER.JS — Build the exam questions from the JSON delivery API
+//
+// With EXAM_DELIVERY = "api" the exam page is a small shell and the
+// questions come from /api/exam/<id>/paper/<version>. The browser keeps
+// that response and revalidates it with its ETag, so a reload costs a
+// 304 instead of the whole exam. The form built here is the same as
+// exam_questions.html, field names included.
+//
+// window.examPaperReady resolves once the questions are on the page;
+// autosave.js waits for it before restoring saved answers.
+
+(() => {
+    const container = document.getElementById("examQuestions");
+    if (!container || !container.dataset.paperUrl) return;
+
+    function el(tag, attributes, text) {
+        const node = document.createElement(tag);
+        for (const name in attributes || {}) node.setAttribute(name, attributes[name]);
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function choice(name, value, label, extraClass) {
+        const wrapper = el("div", { class: "form-check" + (extraClass ? " " + extraClass : "") });
+        const input = el("input", { type: "radio", name: name, value: value });
+        if (extraClass) input.className = "form-check-input";
+        wrapper.append(input, el("label", {}, label));
+        return wrapper;
+    }
+
+    function renderQuestion(q, number, strings) {
+        const name = "q_" + q.id;
+        const card = el("div", { class: "card shadow-sm mb-4" });
+        const body = el("div", { class: "card-body" });
+        card.append(body);
+
+        body.append(el("h5", { class: "fw-bold" }, "Question " + number));
+        body.append(el("p", { class: "fs-5" }, strings[q.text]));
+
+        if (q.type === "MCQ") {
+            q.options.forEach((option, index) => {
+                body.append(choice(name, "ABCD"[index], strings[option], "mb-2"));
+            });
+
+        } else if (q.type === "TF") {
+            body.append(choice(name, "True", "True"), choice(name, "False", "False"));
+
+        } else if (q.type === "Short") {
+            body.append(el("textarea", { class: "form-control", name: name, rows: "3" }));
+
+        } else if (q.type === "Fill") {
+            body.append(el("input", { type: "text", class: "form-control", name: name }));
+
+        } else if (q.type === "Match") {
+            q.match.forEach((left, index) => {
+                body.append(el("label", { class: "fw-bold" }, strings[left]));
+                body.append(el("input", { type: "text", class: "form-control mb-2", name: name + "_" + (index + 1) }));
+            });
+
+        } else if (q.type === "Image") {
+            if (q.image) {
+                const image = el("img", {
+                    src: q.image.src, class: "img-fluid mb-3", alt: "Question image",
+                    loading: "lazy", decoding: "async"
+                });
+                if (q.image.srcset) {
+                    image.setAttribute("srcset", q.image.srcset);
+                    image.setAttribute("sizes", "(max-width: 960px) 100vw, 960px");
+                }
+                body.append(image);
+            }
+            body.append(el("input", { type: "text", class: "form-control", name: name }));
+        }
+
+        return card;
+    }
+
+    function load() {
+        container.replaceChildren(el("p", { class: "text-center text-muted" }, "Loading questions…"));
+
+        return fetch(container.dataset.paperUrl, { credentials: "same-origin" })
+            .then((response) => {
+                if (!response.ok) throw new Error(response.status);
+                return response.json();
+            })
+            .then((paper) => {
+                const fragment = document.createDocumentFragment();
+                paper.questions.forEach((q, index) => {
+                    fragment.append(renderQuestion(q, index + 1, paper.strings));
+                });
+                container.replaceChildren(fragment);
+            })
+            .catch(() => {
+                // Keep the page (and the timer): let the student try again
+                const retry = el("button", { type: "button", class: "btn btn-outline-danger btn-sm ms-2" }, "Try again");
+                const message = el("div", { class: "alert alert-danger text-center" },
+                    "The questions could not be loaded.");
+                message.append(retry);
+                container.replaceChildren(message);
+
+                return new Promise((resolve) => {
+                    retry.addEventListener("click", () => resolve(load()));
+                });
+            });
+    }
+
+    window.examPaperReady = load();
+})();
@@ -0,0 +1,52 @@
+// PROCTOR.JS — Refresh the live proctor view from /api/proctor/<exam_id>
+
+document.addEventListener("DOMContentLoaded", () => {
+    const snapshotElement = document.getElementById("proctorSnapshot");
+    if (!snapshotElement) return;
+
+    const chart = document.getElementById("proctorChart");
+    const students = document.getElementById("proctorStudents");
+
+    function render(snapshot) {
+        document.getElementById("proctorTotal").textContent = snapshot.total;
+        document.getElementById("proctorRate").textContent = snapshot.per_minute_last_5;
+        document.getElementById("proctorFlagged").textContent = snapshot.students_over_threshold;
+
+        const peak = Math.max(1, ...snapshot.per_minute.map((m) => m.count));
+        chart.replaceChildren(...snapshot.per_minute.map((m) => {
+            const bar = document.createElement("div");
+            bar.className = "bg-danger flex-fill";
+            bar.title = `${m.minute}: ${m.count}`;
+            bar.style.height = `${Math.round(m.count * 100 / peak)}%`;
+            return bar;
+        }));
+
+        students.replaceChildren();
+
+        if (snapshot.over_threshold.length === 0) {
+            const row = students.insertRow();
+            const cell = row.insertCell();
+            cell.colSpan = 3;
+            cell.className = "text-center text-muted";
+            cell.textContent = "No student is over the threshold.";
+            return;
+        }
+
+        for (const s of snapshot.over_threshold) {
+            const row = students.insertRow();
+            row.insertCell().textContent = s.student;
+            row.insertCell().textContent = s.count;
+            row.insertCell().textContent = s.last_at;
+        }
+    }
+
+    let snapshot = JSON.parse(snapshotElement.textContent);
+    render(snapshot);
+
+    setInterval(() => {
+        fetch(`/api/proctor/${snapshot.exam_id}`, { credentials: "same-origin" })
+            .then((response) => response.json())
+            .then((next) => { snapshot = next; render(snapshot); })
+            .catch(() => {});
+    }, 5000);
+});
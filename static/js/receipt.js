@@ -0,0 +1,35 @@
+// RECEIPT.JS — Poll for the score of a queued submission
+
+document.addEventListener("DOMContentLoaded", () => {
+    const box = document.getElementById("gradingResult");
+    if (!box) return;
+
+    const scoreElement = document.getElementById("gradingScore");
+    const statusElement = document.getElementById("gradingStatus");
+    let delay = 1000;
+
+    function poll() {
+        fetch(`/grading_result/${box.dataset.receipt}`, { credentials: "same-origin" })
+            .then((response) => response.json())
+            .then((result) => {
+                if (result.status === "done") {
+                    scoreElement.textContent = result.score;
+                    statusElement.textContent = "Your final score";
+                } else if (result.status === "failed") {
+                    scoreElement.textContent = "—";
+                    statusElement.textContent = "Grading failed. Please show your receipt to your teacher.";
+                } else {
+                    schedule();
+                }
+            })
+            .catch(schedule);
+    }
+
+    // Back off gently so a queue of waiting students stays cheap to serve
+    function schedule() {
+        setTimeout(poll, delay);
+        delay = Math.min(delay * 1.5, 10000);
+    }
+
+    poll();
+});
@@ -1,29 +1,60 @@
-// TIMER.JS — Countdown exam timer
+// TIMER.JS — Countdown to the deadline the server recorded at start_exam
+//
+// The page carries the deadline and the server's clock at render time, so
+// a wrong device clock or a reload does not change the time left. The
+// exam clock stream (Server-Sent Events), when EXAM_CLOCK_URL is set,
+// re-syncs the offset and tells the page to submit when the server says
+// time is up; without it the countdown alone submits the page.
 
 document.addEventListener("DOMContentLoaded", () => {
-    const durationElement = document.getElementById("duration");
+    const deadlineElement = document.getElementById("deadline");
     const timerDisplay = document.getElementById("timerText");
-
-    if (!durationElement || !timerDisplay) return;
-
-    let totalSeconds = parseInt(durationElement.value) * 60;
+    const form = document.getElementById("examForm");
+
+    if (!deadlineElement || !timerDisplay || !form) return;
+
+    const deadline = parseInt(deadlineElement.value);
+    // server time = Date.now() + offset
+    let offset = parseInt(document.getElementById("serverNow").value) - Date.now();
+    let submitted = false;
+    let clock = null;
+
+    function submitNow(message) {
+        if (submitted) return;
+        submitted = true;
+        clearInterval(timerInterval);
+        if (clock) clock.close();
+        alert(message);
+        form.submit();
+    }
 
     function updateTimer() {
-        let minutes = Math.floor(totalSeconds / 60);
-        let seconds = totalSeconds % 60;
+        const totalSeconds = Math.max(0, Math.round((deadline - (Date.now() + offset)) / 1000));
+        const minutes = Math.floor(totalSeconds / 60);
+        const seconds = totalSeconds % 60;
 
         timerDisplay.textContent =
             `${String(minutes).padStart(2, '0')}:${String(seconds).padStart(2, '0')}`;
 
         if (totalSeconds <= 0) {
-            clearInterval(timerInterval);
-            alert("Time is up! Your exam will now be submitted.");
-            document.getElementById("examForm").submit();
+            submitNow("Time is up! Your exam will now be submitted.");
         }
-
-        totalSeconds--;
     }
 
     updateTimer();
     const timerInterval = setInterval(updateTimer, 1000);
+
+    const clockUrl = document.getElementById("clockUrl");
+    if (clockUrl && window.EventSource) {
+        clock = new EventSource(clockUrl.value);
+
+        clock.addEventListener("clock", (event) => {
+            offset = JSON.parse(event.data).now - Date.now();
+            updateTimer();
+        });
+
+        clock.addEventListener("submit", () => {
+            submitNow("Time is up! Your exam will now be submitted.");
+        });
+    }
 });
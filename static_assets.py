@@ -0,0 +1,75 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — FINGERPRINTED STATIC ASSETS
+# /assets/<name>.<hash>.<ext> URLs that browsers may cache for a year
+# =========================================
+#
+# Files under /static/ are served with no-cache, so every page view asks
+# again for style.css, autosave.js, timer.js … (a 304 each, but still a
+# round trip per file per student). Templates link them through
+# asset_url("js/timer.js") instead, which puts a hash of the content in
+# the name: /assets/js/timer.3f2a9c1b7e.js. That URL never changes
+# content, so it is served as immutable; a deploy that edits the file
+# produces a new name, and pages pick it up on their next render.
+#
+# Hashes are remembered per (path, mtime), so a file is read again only
+# when it changes.
+
+import hashlib
+import os
+import re
+import threading
+
+
+HASH_LENGTH = 10
+
+FINGERPRINT_RE = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[A-Za-z0-9]+)$" % HASH_LENGTH)
+
+
+class AssetManifest:
+
+    def __init__(self, root, prefix="/assets/"):
+        self.root = root
+        self.prefix = prefix
+        self._hashes = {}  # path -> (mtime, hash)
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        path = os.path.normpath(os.path.join(self.root, name))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"asset outside the static folder: {name}")
+        return path
+
+    def digest(self, name):
+        path = self.path(name)
+        mtime = os.stat(path).st_mtime_ns
+
+        cached = self._hashes.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                sha.update(chunk)
+        value = sha.hexdigest()[:HASH_LENGTH]
+
+        with self._lock:
+            self._hashes[name] = (mtime, value)
+        return value
+
+    # "js/timer.js" -> "/assets/js/timer.3f2a9c1b7e.js"
+    def url(self, name):
+        stem, ext = os.path.splitext(name)
+        return f"{self.prefix}{stem}.{self.digest(name)}{ext}"
+
+    # "js/timer.3f2a9c1b7e.js" -> ("js/timer.js", True if the hash is current).
+    # Raises ValueError for a name that is not a fingerprinted asset.
+    def resolve(self, fingerprinted):
+        match = FINGERPRINT_RE.match(fingerprinted)
+        if match is None:
+            raise ValueError(f"not a fingerprinted asset: {fingerprinted}")
+
+        name = match["stem"] + match["ext"]
+        if not os.path.isfile(self.path(name)):
+            raise ValueError(f"no such asset: {name}")
+        return name, match["hash"] == self.digest(name)
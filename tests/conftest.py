@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+import pytest
+
+# app.py reads its configuration at import time
+_db_dir = tempfile.mkdtemp(prefix="biology-exam-tests-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_db_dir, "test.db")
+os.environ.setdefault("MEDIA_ROOT", os.path.join(_db_dir, "media"))
+os.environ.setdefault("PREWARM_ENABLED", "0")
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def A():
+    app_module.app.config["TESTING"] = True
+    with app_module.app.app_context():
+        app_module.init_db()
+    return app_module
+
+
+@pytest.fixture
+def client(A):
+    return A.app.test_client()
@@ -0,0 +1,62 @@
+def test_exam_summaries_are_in_exam_id_order(A, client):
+    with A.app.app_context():
+        for exam_id in (2, 10, 9, 100, 11):
+            A.db.session.merge(A.ScoreSummary(scope="exam", scope_key=str(exam_id), count=1, total=1,
+                                              total_sq=1, min_score=1, max_score=1))
+        A.db.session.commit()
+
+    with client.session_transaction() as session:
+        session["role"] = "Teacher"
+
+    keys, cursor = [], None
+    while True:
+        query = {"format": "json", "per_page": 2}
+        if cursor:
+            query["exams_cursor"] = cursor
+        exams = client.get("/analytics", query_string=query).get_json()["exams"]
+        keys += [int(item["key"]) for item in exams["items"]]
+        cursor = exams["next_cursor"]
+        if cursor is None:
+            break
+
+    assert keys == sorted(keys)
+    assert {2, 9, 10, 11, 100} <= set(keys)
+
+
+def summary_rows(A, exam_id, grade):
+    scopes = [("exam", str(exam_id)), ("grade", grade)]
+    summaries = {
+        (s.scope, s.scope_key): (s.count, s.total, s.total_sq, s.min_score, s.max_score)
+        for s in A.ScoreSummary.query if (s.scope, s.scope_key) in scopes
+    }
+    buckets = {
+        (b.scope, b.scope_key, b.bucket): b.count
+        for b in A.ScoreBucket.query if (b.scope, b.scope_key) in scopes
+    }
+    return summaries, buckets
+
+
+# Summaries kept up to date per submission match a rebuild from Attempt
+def test_incremental_summaries_match_a_rebuild(A):
+    with A.app.app_context():
+        exam = A.Exam(title="Summaries", grade_id=1, duration=10, version_count=1, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        A.db.session.add(A.Question(exam_id=exam.id, question_text="Q", type="TF",
+                                    points=10, correct_answer="True"))
+        A.db.session.commit()
+
+        A.write_submissions([
+            {"student_name": f"S{i}", "grade": "41", "exam_id": exam.id, "score": score,
+             "violations": 0, "answers": {}, "total_points": 10}
+            for i, score in enumerate([2.0, 9.5, 10.0, 4.0])
+        ])
+        incremental = summary_rows(A, exam.id, "41")
+
+        A.rebuild_score_summaries(exam.id)
+        assert summary_rows(A, exam.id, "41") == incremental
+
+        summaries, buckets = incremental
+        assert summaries[("exam", str(exam.id))] == (4, 25.5, 4 + 90.25 + 100 + 16, 2.0, 10.0)
+        exam_buckets = {bucket: count for (scope, _, bucket), count in buckets.items() if scope == "exam"}
+        assert exam_buckets == {2: 1, 4: 1, 9: 2}
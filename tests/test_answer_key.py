@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from answer_key import ExamCache, compile_answer_key
+
+
+def question(qid, q_type, points=1, **fields):
+    values = dict(correct_answer=None, fill_answers=None, match_pairs=None,
+                  answer_variants=None, max_edits=None)
+    values.update(fields)
+    return SimpleNamespace(id=qid, type=q_type, points=points, **values)
+
+
+EXAM = SimpleNamespace(id=7, negative=0.5)
+
+QUESTIONS = [
+    question(1, "MCQ", correct_answer="B"),
+    question(2, "TF", correct_answer="True"),
+    question(3, "Short", points=2, correct_answer="Mitochondria"),
+    question(4, "Fill", fill_answers="chlorophyll, chloroplast"),
+    question(5, "Match", points=3, match_pairs="DNA:nucleus,ATP:mitochondria"),
+]
+
+
+def test_collect_and_score_a_submitted_form():
+    key = compile_answer_key(EXAM, QUESTIONS)
+    assert key.total_points == 8
+
+    form = {"q_1": "B", "q_2": "True", "q_3": " mitochondria ", "q_4": "Chloroplast",
+            "q_5_1": "Nucleus", "q_5_2": "mitochondria", "q_99": "ignored"}
+    answers = key.collect(form)
+    assert answers == {1: "B", 2: "True", 3: " mitochondria ", 4: "Chloroplast",
+                       5: ("Nucleus", "mitochondria")}
+    assert key.score(answers) == 8
+
+
+def test_negative_marking_only_for_penalized_types_and_never_below_zero():
+    key = compile_answer_key(EXAM, QUESTIONS)
+    assert key.score({1: "A", 3: "ribosome", 4: "leaf"}) == 0
+    assert key.score({1: "A", 3: "mitochondria"}) == 1.5
+    assert key.score({1: "A", 2: "False", 3: "mitochondria"}) == 1.0
+
+
+def test_blank_match_parts_are_not_collected():
+    key = compile_answer_key(EXAM, QUESTIONS)
+    assert key.collect({"q_5_1": " ", "q_5_2": ""}) == {}
+
+
+def test_cache_compiles_once_and_drops_keys_compiled_during_invalidation():
+    cache = ExamCache()
+    calls = []
+
+    def loader(exam_id):
+        calls.append(exam_id)
+        return f"key {exam_id} #{len(calls)}"
+
+    assert cache.get(1, loader) == "key 1 #1"
+    assert cache.get(1, loader) == "key 1 #1"
+    cache.invalidate(1)
+    assert cache.get(1, loader) == "key 1 #2"
+
+    # A key compiled while the exam was invalidated is returned, not kept
+    def racing_loader(exam_id):
+        cache.invalidate(exam_id)
+        return "stale"
+
+    assert cache.get(2, racing_loader) == "stale"
+    assert cache.get(2, loader) == "key 2 #3"
+    assert cache.get(3, lambda exam_id: None) is None
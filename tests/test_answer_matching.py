@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from answer_matching import EXACT, FUZZY, NORMALIZED, AnswerMatcher, bounded_distance, match_key
+
+
+OPPOSITES = [
+    ("hypotonic", "hypertonic"),
+    ("endocytosis", "exocytosis"),
+    ("catabolism", "anabolism"),
+    ("hypoglycemia", "hyperglycemia"),
+    ("ectotherm", "endotherm"),
+    ("endergonic", "exergonic"),
+]
+
+
+@pytest.mark.parametrize("mode", [NORMALIZED, FUZZY])
+@pytest.mark.parametrize("accepted, answer", OPPOSITES + [(b, a) for a, b in OPPOSITES])
+def test_biology_opposites_are_not_typos(mode, accepted, answer):
+    assert not AnswerMatcher([accepted], mode).matches(answer)
+    # Not even when the teacher allows two typos on the question
+    assert not AnswerMatcher([accepted], mode, max_edits=2).matches(answer)
+
+
+@pytest.mark.parametrize("answer", ["Mitocondria", "mitochondrias", " MITOCHONDRIA.", "mitochondira"])
+def test_fuzzy_accepts_one_typo_or_form_variant(answer):
+    assert AnswerMatcher(["mitochondria"], FUZZY).matches(answer) is (answer != "mitochondira")
+
+
+def test_normalized_accepts_form_variants_but_no_typos():
+    matcher = AnswerMatcher(["cell membrane", "plasma membrane"], NORMALIZED)
+    assert matcher.matches("Cell-Membranes.")
+    assert matcher.matches("plasma  membrane")
+    assert not matcher.matches("plasma membrain")
+
+
+def test_normalized_allows_typos_where_the_question_opts_in():
+    assert AnswerMatcher(["photosynthesis"], NORMALIZED, max_edits=1).matches("photosynthesys")
+    assert not AnswerMatcher(["photosynthesis"], FUZZY, max_edits=0).matches("photosynthesys")
+
+
+def test_short_terms_and_numbers_need_exact_keys():
+    assert not AnswerMatcher(["ATP"], FUZZY).matches("ADP")
+    assert not AnswerMatcher(["46"], FUZZY, max_edits=1).matches("47")
+    assert AnswerMatcher(["46"], FUZZY).matches(" 46 ")
+
+
+def test_exact_mode_only_normalizes_case_and_spacing():
+    matcher = AnswerMatcher(["Photosynthesis"], EXACT)
+    assert matcher.matches("  photosynthesis ")
+    assert not matcher.matches("photosynthesis.")
+
+
+def test_match_key_folds_unicode_and_plurals():
+    assert match_key("ｍｉｔｏｃｈｏｎｄｒｉａ") == "mitochondria"
+    assert match_key("Viruses") == match_key("virus")
+    assert match_key("Cell-Membranes.") == "cellmembrane"
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j - 1] + (ca != cb), previous[j] + 1, current[j - 1] + 1))
+        previous = current
+    return previous[-1]
+
+
+def test_bounded_distance_agrees_with_levenshtein():
+    rng = random.Random(7)
+    for _ in range(5000):
+        a = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 9)))
+        b = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 9)))
+        limit = rng.randint(0, 3)
+        distance = levenshtein(a, b)
+        expected = distance if distance <= limit else limit + 1
+        assert bounded_distance(a, b, limit) == expected, (a, b, limit)
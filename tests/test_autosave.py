@@ -0,0 +1,110 @@
+from autosave import apply_delta
+from response_store import unpack_answers
+
+
+def test_apply_delta_drops_questions_not_on_the_exam():
+    answers = apply_delta({}, {"q_1": "B", "q_2_2": "nucleus", "q_99": "x" * 50, "q_3_1": "y"}, {1, 2})
+    assert answers == {1: "B", 2: ("", "nucleus")}
+
+
+def make_exam(A):
+    with A.app.app_context():
+        exam = A.Exam(title="Drafts", grade_id=1, duration=30, version_count=1, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        question = A.Question(exam_id=exam.id, question_text="Powerhouse of the cell?", type="Short",
+                              points=1, correct_answer="mitochondria")
+        A.db.session.add(question)
+        A.db.session.commit()
+        return exam.id, question.id
+
+
+def log_in(A, student=None, name="Sam Lee"):
+    student = student or A.app.test_client()
+    student.post("/student_login", data={"student_name": name, "grade": "1", "class_code": "8B"})
+    return student
+
+
+def draft_answers(A, exam_id):
+    with A.app.app_context():
+        return [unpack_answers(d.data) for d in A.AnswerDraft.query.filter_by(exam_id=exam_id)]
+
+
+# A lost session (crash, new device, logging in again) finds the draft
+def test_logging_in_again_gets_the_draft_back(A):
+    exam_id, qid = make_exam(A)
+
+    student = log_in(A)
+    assert student.get(f"/start_exam/{exam_id}").status_code == 200
+    response = student.post("/autosave", json={"answers": {f"q_{qid}": "mitochondria", "q_123456": "spam"}})
+    assert response.get_json()["ok"]
+    assert draft_answers(A, exam_id) == [{qid: "mitochondria"}]
+
+    student.get("/logout")
+    log_in(A, student)
+    response = student.get(f"/start_exam/{exam_id}")
+    assert response.status_code == 409
+    assert "already in progress" in response.get_data(as_text=True)
+
+    response = student.post(f"/start_exam/{exam_id}", data={"take_over": "1"})
+    assert response.status_code == 200
+    assert "mitochondria" in response.get_data(as_text=True)
+
+    student.post("/submit_exam", data={"violations": "0"})
+    with A.app.app_context():
+        assert [a.score for a in A.Attempt.query.filter_by(exam_id=exam_id)] == [1]
+        assert A.AnswerDraft.query.filter_by(exam_id=exam_id).count() == 0
+
+
+# Only the browser the exam is running in writes the draft
+def test_second_browser_with_the_same_name_cannot_write_the_draft(A):
+    exam_id, qid = make_exam(A)
+
+    first = log_in(A)
+    first.get(f"/start_exam/{exam_id}")
+    first.post("/autosave", json={"answers": {f"q_{qid}": "mitochondria"}})
+
+    second = log_in(A)
+    assert second.get(f"/start_exam/{exam_id}").status_code == 409
+    assert second.post("/autosave", json={"answers": {f"q_{qid}": "nucleus"}}).status_code == 409
+    assert draft_answers(A, exam_id) == [{qid: "mitochondria"}]
+
+    # Once the exam moved to the second browser, the first one is read-only
+    second.post(f"/start_exam/{exam_id}", data={"take_over": "1"})
+    assert first.post("/autosave", json={"answers": {f"q_{qid}": "nucleus"}}).status_code == 409
+    assert draft_answers(A, exam_id) == [{qid: "mitochondria"}]
+
+
+def delete_exam(A, exam_id):
+    with A.app.app_context():
+        A.Question.query.filter_by(exam_id=exam_id).delete()
+        A.Exam.query.filter_by(id=exam_id).delete()
+        A.db.session.commit()
+        A.invalidate_exam(exam_id)
+
+
+# An exam deleted mid-exam: its students are sent back to the exam list,
+# and the batch their autosave shares with other students still commits
+def test_deleted_exam_does_not_break_autosave_batch_or_submit(A):
+    gone_id, gone_qid = make_exam(A)
+    kept_id, kept_qid = make_exam(A)
+    gone = log_in(A, name="Gone Exam")
+    gone.get(f"/start_exam/{gone_id}")
+    kept = log_in(A, name="Kept Exam")
+    kept.get(f"/start_exam/{kept_id}")
+
+    delete_exam(A, gone_id)
+
+    with A.app.app_context():
+        drafts = {d.exam_id: d for d in A.AnswerDraft.query.filter(A.AnswerDraft.exam_id.in_([gone_id, kept_id]))}
+        deltas = [
+            {"student_key": drafts[exam_id].student_key, "exam_id": exam_id, "owner": drafts[exam_id].owner,
+             "version": drafts[exam_id].version, "fields": {f"q_{qid}": "mitochondria"}}
+            for exam_id, qid in ((gone_id, gone_qid), (kept_id, kept_qid))
+        ]
+        assert A.write_autosaves(deltas) == [False, True]
+    assert draft_answers(A, kept_id) == [{kept_qid: "mitochondria"}]
+
+    response = gone.post("/submit_exam", data={"violations": "0"})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/select_exam")
@@ -0,0 +1,22 @@
+from bench.common import percentile, summarize, seed_exam
+from bench.flow import run_client
+
+
+def test_percentiles_and_summary():
+    samples = [0.001 * n for n in range(1, 101)]
+    assert percentile(sorted(samples), 50) == samples[50]
+    assert percentile([], 99) == 0.0
+
+    summary = summarize(samples, wall_seconds=2.0)
+    assert summary["count"] == 100
+    assert summary["max_ms"] == 100.0
+    assert summary["throughput_per_s"] == 50.0
+
+
+# The student flow benchmark runs end to end without HTTP errors
+def test_student_flow_through_the_test_client(A):
+    exam_id = seed_exam(A, 9, versions=2)
+    results = run_client(A, exam_id, students=4)
+
+    assert results["flow"]["errors"] == 0, results["flow"]["error_samples"]
+    assert results["submit_exam"]["count"] == 4
@@ -0,0 +1,4 @@
+# Test fixtures and the CLI may build the app more than once per process
+def test_create_app_can_be_called_again(A):
+    assert A.create_app() is A.app
+    assert A.create_app() is A.app
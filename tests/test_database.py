@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+from database import SubmissionWriter, apply_sqlite_pragmas, database_url, migrate_schema, sqlite_pragmas
+
+
+def test_database_urls():
+    assert database_url("postgres://u:p@db/exams") == "postgresql://u:p@db/exams"
+    assert database_url("sqlite:///exam.db") == "sqlite:///exam.db"
+
+
+def test_pragmas_are_set_on_every_new_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    apply_sqlite_pragmas(engine, sqlite_pragmas({"SQLITE_SYNCHRONOUS": "NORMAL"}))
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 10000
+
+
+def test_concurrent_submissions_are_group_committed():
+    batches = []
+    release = threading.Event()
+
+    def flush(items):
+        release.wait(5)
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    writer = SubmissionWriter(flush, max_batch=50, max_wait=0.2)
+    futures = [writer.submit(n) for n in range(20)]
+    release.set()
+
+    assert [f.result(timeout=5) for f in futures] == [n * 10 for n in range(20)]
+    assert sum(len(batch) for batch in batches) == 20
+    assert len(batches) < 20
+    assert writer.items == 20
+
+
+# One bad submission must not fail the others in its batch
+def test_failed_batch_is_retried_one_by_one():
+    def flush(items):
+        if "bad" in items:
+            raise ValueError("constraint failed")
+        return [item.upper() for item in items]
+
+    writer = SubmissionWriter(flush, max_batch=10, max_wait=0.2)
+    futures = [writer.submit(item) for item in ("a", "bad", "c")]
+
+    assert futures[0].result(timeout=5) == "A"
+    assert futures[2].result(timeout=5) == "C"
+    with pytest.raises(ValueError):
+        futures[1].result(timeout=5)
+
+
+# An older database gains the new nullable columns and indexes, and a
+# second run has nothing left to do
+def test_migrate_schema_adds_missing_columns_and_indexes(tmp_path):
+    from sqlalchemy import Column, Index, Integer, MetaData, String, Table, inspect
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE attempt (id INTEGER PRIMARY KEY, exam_id INTEGER)")
+        conn.exec_driver_sql("INSERT INTO attempt (id, exam_id) VALUES (1, 5)")
+
+    metadata = MetaData()
+    Table("attempt", metadata,
+          Column("id", Integer, primary_key=True),
+          Column("exam_id", Integer),
+          Column("grade", String(50)),
+          Index("ix_attempt_exam_grade", "exam_id", "grade"))
+    Table("grading_job", metadata, Column("id", Integer, primary_key=True))
+
+    assert migrate_schema(engine, metadata) == [
+        "added column attempt.grade",
+        "created index ix_attempt_exam_grade",
+    ]
+    assert migrate_schema(engine, metadata) == []
+
+    inspector = inspect(engine)
+    assert "grading_job" in inspector.get_table_names()
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT id, exam_id, grade FROM attempt").all() == [(1, 5, None)]
+
+
+# Every hot route's statement is answered from an index, not a table scan
+def test_hot_queries_use_indexes(A):
+    result = A.app.test_cli_runner().invoke(args=["explain-queries"])
+    assert result.exit_code == 0
+
+    plans = [line.strip() for line in result.output.splitlines() if line.startswith("   ")]
+    assert plans
+    assert not [plan for plan in plans if plan.startswith("SCAN ") and "INDEX" not in plan]
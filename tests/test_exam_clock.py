@@ -0,0 +1,51 @@
+def start_timed_exam(A, client, name):
+    with A.app.app_context():
+        exam = A.Exam(title="Timed", grade_id=1, duration=20, version_count=1, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        A.db.session.add(A.Question(exam_id=exam.id, question_text="Q", type="TF",
+                                    points=1, correct_answer="True"))
+        A.db.session.commit()
+        exam_id = exam.id
+
+    client.post("/student_login", data={"student_name": name, "grade": "1", "class_code": "7A"})
+    return client.get(f"/start_exam/{exam_id}").get_data(as_text=True)
+
+
+def test_no_clock_stream_without_async_clock_server(A, client):
+    html = start_timed_exam(A, client, "Local Countdown")
+    assert 'id="deadline"' in html
+    assert 'id="clockUrl"' not in html
+    assert client.get("/exam_clock").status_code == 404
+
+
+def test_clock_stream_url_when_configured(A, client, monkeypatch):
+    monkeypatch.setitem(A.app.config, "EXAM_CLOCK_URL", "/clock")
+    html = start_timed_exam(A, client, "Synced Countdown")
+    assert 'id="clockUrl" value="/clock?token=' in html
+
+
+# Logging out and in again (or rebuilt versions) must not restart the clock
+def test_late_student_cannot_restart_the_clock(A, client):
+    start_timed_exam(A, client, "Late Student")
+    with A.app.app_context():
+        draft = A.AnswerDraft.query.filter(A.AnswerDraft.student_key.endswith("late student")).one()
+        exam_id = draft.exam_id
+        qid = A.Question.query.filter_by(exam_id=exam_id).one().id
+        draft.started_at -= A.timedelta(minutes=30)
+        draft.deadline -= A.timedelta(minutes=30)
+        deadline = draft.deadline
+        draft.version = 99  # a version the rebuilt exam no longer has
+        A.db.session.commit()
+
+    client.get("/logout")
+    client.post("/student_login", data={"student_name": "Late Student", "grade": "1", "class_code": "7A"})
+    assert client.post(f"/start_exam/{exam_id}", data={"take_over": "1"}).status_code == 200
+
+    with A.app.app_context():
+        draft = A.AnswerDraft.query.filter_by(exam_id=exam_id).one()
+        assert draft.deadline == deadline
+
+    client.post("/submit_exam", data={f"q_{qid}": "True", "violations": "0"})
+    with A.app.app_context():
+        assert A.Attempt.query.filter_by(exam_id=exam_id).one().score == 0
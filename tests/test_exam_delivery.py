@@ -0,0 +1,90 @@
+import gzip
+import json
+import os
+from types import SimpleNamespace
+
+import exam_delivery
+from static_assets import AssetManifest
+
+
+def start_exam(A):
+    with A.app.app_context():
+        exam = A.Exam(title="Delivery", grade_id=1, duration=30, version_count=1, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        A.db.session.add_all([
+            A.Question(exam_id=exam.id, question_text="Site of photosynthesis?", type="MCQ", points=1,
+                       option_a="Chloroplast", option_b="Nucleus", option_c="Ribosome",
+                       option_d="Vacuole", correct_answer="A"),
+            A.Question(exam_id=exam.id, question_text="Cells divide by mitosis.", type="TF", points=1,
+                       correct_answer="True"),
+        ])
+        A.db.session.commit()
+        exam_id = exam.id
+
+    student = A.app.test_client()
+    student.post("/student_login", data={"student_name": "Paper Reader", "grade": "1", "class_code": "7A"})
+    student.get(f"/start_exam/{exam_id}")
+    with student.session_transaction() as session:
+        version = session["version"]
+    return student, f"/api/exam/{exam_id}/paper/{version}"
+
+
+# The payload is what the student sees, without the key; a reload with the
+# ETag is answered with an empty 304
+def test_paper_is_revalidated_with_its_etag(A):
+    student, url = start_exam(A)
+
+    response = student.get(url, headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    payload = json.loads(response.data)
+    assert payload["format"] == exam_delivery.FORMAT
+    assert {"Chloroplast", "Nucleus", "Site of photosynthesis?"} <= set(payload["strings"])
+    assert "correct_answer" not in response.get_data(as_text=True)
+
+    tag = response.headers["ETag"]
+    again = student.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": tag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+    other = A.app.test_client()
+    other.post("/student_login", data={"student_name": "Someone Else", "grade": "1", "class_code": "7A"})
+    assert other.get(url).status_code == 403
+
+
+def test_encoding_follows_accept_encoding(A, monkeypatch):
+    student, url = start_exam(A)
+    plain = student.get(url, headers={"Accept-Encoding": "identity"})
+
+    zipped = student.get(url, headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.data) == plain.data
+    assert zipped.headers["ETag"] != plain.headers["ETag"]
+    assert "Accept-Encoding" in zipped.headers["Vary"]
+
+    # brotli is optional; when installed it wins over gzip
+    fake_brotli = SimpleNamespace(compress=lambda body, quality: b"br:" + body)
+    monkeypatch.setattr(exam_delivery, "brotli", fake_brotli)
+    monkeypatch.setattr(exam_delivery, "_brotli_loaded", True)
+
+    brotli = student.get(url, headers={"Accept-Encoding": "gzip, br"})
+    assert brotli.headers["Content-Encoding"] == "br"
+    assert brotli.data == b"br:" + plain.data
+    assert student.get(url, headers={"Accept-Encoding": "br;q=0.5, gzip"}).headers["Content-Encoding"] == "gzip"
+
+
+def test_asset_urls_carry_a_content_hash(tmp_path):
+    (tmp_path / "js").mkdir()
+    script = tmp_path / "js" / "timer.js"
+    script.write_text("tick()")
+    assets = AssetManifest(str(tmp_path))
+
+    url = assets.url("js/timer.js")
+    assert url.startswith("/assets/js/timer.") and url.endswith(".js")
+    assert assets.resolve(url[len("/assets/"):]) == ("js/timer.js", True)
+
+    script.write_text("tock()")
+    os.utime(script, ns=(0, script.stat().st_mtime_ns + 1_000_000_000))
+    assert assets.resolve(url[len("/assets/"):]) == ("js/timer.js", False)
+    assert assets.url("js/timer.js") != url
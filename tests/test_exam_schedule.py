@@ -0,0 +1,53 @@
+import exam_schedule
+
+
+class FrozenClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_admission_defers_instead_of_long_waits():
+    clock = FrozenClock()
+    queue = exam_schedule.AdmissionQueue(rate=20, burst=5, max_wait=0.05, clock=clock)
+
+    results = [queue.reserve() for _ in range(20)]
+    admitted = [wait for ok, wait in results if ok]
+
+    assert len(admitted) == 7
+    assert max(admitted) <= 0.05
+    assert queue.deferred == 13
+
+    clock.now += 1.0
+    assert queue.reserve()[0]
+
+
+# A class clicking Start at once: starts past the first few get the
+# waiting page with Retry-After, none sleeps in the request
+def test_exam_start_spike_gets_retry_after(A, client, monkeypatch):
+    with A.app.app_context():
+        exam = A.Exam(title="Spike", grade_id=1, duration=30, version_count=1, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        exam_id = exam.id
+
+    clock = FrozenClock()
+    monkeypatch.setattr(A, "admission", exam_schedule.AdmissionQueue(
+        rate=20, burst=0, max_wait=A.app.config["ADMISSION_MAX_WAIT"], clock=clock))
+    slept = []
+    monkeypatch.setattr(A.time, "sleep", slept.append)
+
+    statuses = []
+    for i in range(5):
+        with A.app.test_client() as student:
+            student.post("/student_login", data={"student_name": f"Spike {i}", "grade": "1", "class_code": "9C"})
+            response = student.get(f"/start_exam/{exam_id}")
+            statuses.append(response.status_code)
+            if response.status_code == 503:
+                assert int(response.headers["Retry-After"]) >= 1
+
+    assert statuses.count(503) >= 3
+    assert all(seconds <= A.app.config["ADMISSION_MAX_WAIT"] for seconds in slept)
@@ -0,0 +1,46 @@
+from versions import LETTERS
+
+
+def add_mcq(A, exam_id, text):
+    q = A.Question(exam_id=exam_id, question_text=text, type="MCQ", points=1,
+                   option_a="Nucleus", option_b="Ribosome", option_c="Mitochondria",
+                   option_d="Golgi body", correct_answer="A")
+    A.db.session.add(q)
+    return q
+
+
+# A teacher adding a question mid-exam rebuilds the versions; students who
+# already have the page must still be graded on the letters they saw.
+def test_adding_a_question_keeps_option_letters_of_open_exams(A, client):
+    with A.app.app_context():
+        exam = A.Exam(title="Cells", grade_id=1, duration=30, version_count=2, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        exam_id = exam.id
+        for i in range(10):
+            add_mcq(A, exam_id, f"Question {i}")
+        A.db.session.commit()
+
+    client.post("/student_login", data={"student_name": "Mid Exam", "grade": "1", "class_code": "7A"})
+    assert client.get(f"/start_exam/{exam_id}").status_code == 200
+    with client.session_transaction() as session:
+        version = session["version"]
+
+    with A.app.app_context():
+        paper = A.get_exam_paper(exam_id, version)
+        # The letter shown for the original (correct) option A
+        form = {
+            f"q_{q['id']}": LETTERS[[letter for letter, _ in q["options"]].index("A")]
+            for q in paper.questions
+        }
+
+        add_mcq(A, exam_id, "Added late")
+        A.db.session.commit()
+        A.invalidate_exam(exam_id)
+
+    response = client.post("/submit_exam", data=dict(form, violations="0"))
+    assert response.status_code == 200
+
+    with A.app.app_context():
+        attempt = A.Attempt.query.filter_by(exam_id=exam_id, student_name="Mid Exam").one()
+        assert attempt.score == 10
@@ -0,0 +1,43 @@
+import pytest
+
+from excel_import import map_row
+
+
+def row(points):
+    return {"question_text": "Is DNA a double helix?", "type": "TF", "correct_answer": "True", "points": points}
+
+
+@pytest.mark.parametrize("points, expected", [("2", 2), ("3.0", 3), (4, 4), (None, 1), ("", 1)])
+def test_points_are_parsed(points, expected):
+    assert map_row(row(points), 1)["points"] == expected
+
+
+@pytest.mark.parametrize("points, message", [
+    ("inf", "points must be a number, got 'inf'"),
+    ("-Infinity", "points must be a number"),
+    ("nan", "points must be a number"),
+    ("1e400", "points must be a number"),
+    ("ten", "points must be a number, got 'ten'"),
+    ("-1", "points cannot be negative"),
+    ("1e6", "points cannot be more than"),
+])
+def test_bad_points_reject_the_row(points, message):
+    with pytest.raises(ValueError, match=message):
+        map_row(row(points), 1)
+
+
+def test_add_question_rejects_infinite_points(A, client):
+    with A.app.app_context():
+        exam = A.Exam(title="Points", grade_id=1, duration=30, version_count=1, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        exam_id = exam.id
+
+    response = client.post(f"/add_question/{exam_id}", data={
+        "question": "Is DNA a double helix?", "type": "TF", "points": "inf", "correct_tf": "True"
+    })
+    assert response.status_code == 400
+    assert "points must be a number" in response.get_data(as_text=True)
+
+    with A.app.app_context():
+        assert A.Question.query.filter_by(exam_id=exam_id).count() == 0
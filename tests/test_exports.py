@@ -0,0 +1,25 @@
+import csv
+import io
+
+from openpyxl import load_workbook
+
+from exports import csv_chunks, xlsx_chunks
+
+
+ROWS = [(1, "=HYPERLINK(\"http://example.com\",\"x\")", 7.5),
+        (2, "+1", None), (3, "-2", -2), (4, "@SUM(A1)", 0), (5, "\tTab", 1), (6, "Plain Name", 1)]
+
+
+def test_csv_export_neutralizes_formulas():
+    text = b"".join(csv_chunks(["id", "student_name", "score"], ROWS)).decode("utf-8-sig")
+    names = [row[1] for row in csv.reader(io.StringIO(text))][1:]
+    assert names[:5] == ["'" + row[1] for row in ROWS[:5]]
+    assert names[5] == "Plain Name"
+
+
+def test_xlsx_export_writes_formulas_as_text():
+    workbook = load_workbook(io.BytesIO(b"".join(xlsx_chunks(["id", "student_name", "score"], ROWS))))
+    cells = list(workbook.active.iter_rows(min_row=2, values_only=True))
+    assert [c[1] for c in cells][:4] == ["'" + row[1] for row in ROWS[:4]]
+    assert all(workbook.active.cell(row=r, column=2).data_type == "s" for r in range(2, 8))
+    assert cells[2][2] == -2   # numbers stay numbers
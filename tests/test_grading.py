@@ -0,0 +1,81 @@
+import pickle
+from datetime import datetime, timedelta
+
+import grading
+
+
+def queue_jobs(A, count):
+    A.db.session.query(A.GradingJob).delete()
+    jobs = [A.GradingJob(receipt=grading.new_receipt(), exam_id=1) for _ in range(count)]
+    A.db.session.add_all(jobs)
+    A.db.session.commit()
+    return [job.id for job in jobs]
+
+
+def claim(A, worker, limit=10, lease_seconds=60):
+    return [job.id for job in grading.claim_jobs(A.db.session, A.GradingJob, worker, limit, lease_seconds)]
+
+
+# Two workers never share a job, and a dead worker's jobs come back once
+# its lease runs out
+def test_claimed_jobs_return_to_the_queue_when_the_lease_expires(A):
+    with A.app.app_context():
+        ids = queue_jobs(A, 3)
+
+        assert claim(A, "w1", limit=2) == ids[:2]
+        assert claim(A, "w2") == ids[2:]
+        assert claim(A, "w3") == []
+
+        A.db.session.query(A.GradingJob).filter(A.GradingJob.id == ids[0]).update(
+            {"lease_until": datetime.now() - timedelta(seconds=1)})
+        A.db.session.commit()
+
+        assert claim(A, "w3") == [ids[0]]
+        job = A.db.session.get(A.GradingJob, ids[0])
+        assert (job.worker, job.tries) == ("w3", 2)
+
+        # The old worker's late failure does not touch the job it lost
+        grading.release_job(A.db.session, A.GradingJob, ids[0], "w1", "boom", max_tries=3, backoff_seconds=1)
+        A.db.session.refresh(job)
+        assert (job.status, job.worker, job.error) == (grading.RUNNING, "w3", None)
+
+
+def test_failed_jobs_back_off_and_then_fail_for_good(A):
+    with A.app.app_context():
+        (job_id,) = queue_jobs(A, 1)
+
+        claim(A, "w1")
+        grading.release_job(A.db.session, A.GradingJob, job_id, "w1", "boom", max_tries=2, backoff_seconds=60)
+        job = A.db.session.get(A.GradingJob, job_id)
+        assert (job.status, job.error) == (grading.QUEUED, "boom")
+        assert job.not_before > datetime.now() + timedelta(seconds=30)
+        assert claim(A, "w1") == []
+
+        job.not_before = None
+        A.db.session.commit()
+        assert claim(A, "w1") == [job_id]
+        grading.release_job(A.db.session, A.GradingJob, job_id, "w1", "boom", max_tries=2, backoff_seconds=60)
+        A.db.session.refresh(job)
+        assert job.status == grading.FAILED
+        assert grading.queue_depth(A.db.session, A.GradingJob) == 0
+
+
+def test_drain_worker_returns_once_the_queue_is_empty():
+    batches = [[1, 2], [3], []]
+    graded = []
+    assert grading.run_worker(lambda: batches.pop(0), graded.extend, drain=True) == 3
+    assert graded == [1, 2, 3]
+
+
+# Off POSIX the workers are spawned, so their target must pickle
+def test_drain_command_passes_a_picklable_target(A, monkeypatch):
+    targets = []
+    monkeypatch.setattr(A.grading, "start_worker_processes",
+                        lambda target, processes: targets.append(target) or [])
+
+    result = A.app.test_cli_runner().invoke(args=["grading", "drain"])
+
+    assert result.exit_code == 0, result.output
+    worker = pickle.loads(pickle.dumps(targets[0]))
+    assert worker.func is A.grading_worker
+    assert worker.keywords == {"drain": True}
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+from answer_key import compile_answer_key
+from item_analysis import ItemStats
+from regrade import ResponseMatrix
+
+
+def mcq(qid, correct):
+    return SimpleNamespace(id=qid, type="MCQ", points=1, correct_answer=correct, fill_answers=None,
+                           match_pairs=None, answer_variants=None, max_edits=None)
+
+
+KEY = compile_answer_key(SimpleNamespace(id=1, negative=0), [mcq(1, "A"), mcq(2, "B"), mcq(3, "C")])
+
+# Correctness        u
+#   1 1 1            3
+#   1 1 0            2
+#   1 0 0            1
+#   0 1 0            1
+#   0 0 0            0
+ANSWERS = [
+    {1: "A", 2: "B", 3: "C"},
+    {1: "A", 2: "B", 3: "D"},
+    {1: "A", 2: "C"},
+    {1: "B", 2: "B", 3: "A"},
+    {2: "A", 3: "B"},
+]
+
+
+def matrix(attempts):
+    m = ResponseMatrix(KEY)
+    for attempt_id, answers in attempts:
+        m.add(attempt_id, answers)
+    return m
+
+
+# Worked by hand: p = .6 .6 .2, Σpq = .64, var(u) = 3 - 1.4² = 1.04,
+# KR-20 = 3/2 · (1 - .64/1.04); item 3 against rest scores 2 2 1 1 0:
+# cov = .4 - .2·1.2 = .16, r = .16 / √(.16 · .56)
+def test_report_matches_hand_computed_statistics():
+    stats = ItemStats([1, 2, 3])
+    stats.add_matrix(matrix(enumerate(ANSWERS, start=1)))
+    report = stats.report(KEY)
+
+    assert report["attempts"] == 5
+    assert report["kr20"] == 0.577
+    assert (report["mean"], report["stdev"]) == (1.4, 1.02)
+    assert [item["p_value"] for item in report["items"]] == [0.6, 0.6, 0.2]
+    assert [item["point_biserial"] for item in report["items"]] == [0.327, 0.327, 0.535]
+
+    options = report["items"][0]["options"]
+    assert [(o["label"], o["count"], o["correct"]) for o in options] == [
+        ("(blank)", 1, False), ("A", 3, True), ("B", 1, False), ("C", 0, False), ("D", 0, False)]
+
+
+def test_sums_folded_in_batches_and_reloaded_give_the_same_report():
+    whole = ItemStats([1, 2, 3])
+    whole.add_matrix(matrix(enumerate(ANSWERS, start=1)))
+
+    batched = ItemStats([1, 2, 3])
+    batched.add_matrix(matrix(list(enumerate(ANSWERS, start=1))[:2]))
+    batched = ItemStats.from_json(batched.to_json())
+    batched.add_matrix(matrix(list(enumerate(ANSWERS, start=1))[2:]))
+
+    assert batched.last_attempt_id == 5
+    assert batched.report(KEY) == whole.report(KEY)
+
+
+def test_constant_items_have_no_discrimination():
+    stats = ItemStats([1, 2, 3])
+    stats.add_matrix(matrix([(1, {1: "A"}), (2, {1: "A", 2: "B"})]))
+    report = stats.report(KEY)
+
+    assert [item["point_biserial"] for item in report["items"]] == [None, None, None]
+    assert ItemStats([1]).report(KEY)["kr20"] is None
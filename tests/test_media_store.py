@@ -0,0 +1,47 @@
+import io
+import os
+
+import pytest
+
+from media_store import MediaStore, image_sources
+
+PIL = pytest.importorskip("PIL.Image")
+
+
+def png(size, mode="RGB"):
+    out = io.BytesIO()
+    PIL.new(mode, size).save(out, "PNG")
+    return out.getvalue()
+
+
+def stored_files(root):
+    return sorted(name for _, _, files in os.walk(root) for name in files)
+
+
+def test_upload_is_stored_once_under_its_hash_with_variants(tmp_path):
+    store = MediaStore(str(tmp_path), widths=(100, 400))
+    first = store.put(io.BytesIO(png((300, 200))))
+    again = store.put(io.BytesIO(png((300, 200))))
+
+    assert first == again
+    assert first["name"] == f"{first['sha256']}.png"
+    assert (first["width"], first["height"]) == (300, 200)
+    assert [width for width, _ in first["variants"]] == [100, 300]
+    assert all(store.exists(name) for _, name in first["variants"])
+    assert len(stored_files(tmp_path)) == 3
+
+    sources = image_sources(first["name"], first["variants"])
+    assert sources["src"] == f"/media/{first['variants'][-1][1]}"
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"GIF89a but not really an image", "damaged"),
+    (png((300, 200))[:60], "damaged"),
+    (png((8000, 6000), mode="1"), "too large"),
+    (b"%PDF-1.7", "not a PNG"),
+])
+def test_rejected_upload_leaves_nothing_in_the_store(tmp_path, data, message):
+    store = MediaStore(str(tmp_path))
+    with pytest.raises(ValueError, match=message):
+        store.put(io.BytesIO(data))
+    assert stored_files(tmp_path) == []
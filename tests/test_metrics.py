@@ -0,0 +1,48 @@
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from metrics import BUCKETS, Histogram, Metrics, init_metrics
+
+
+def test_histogram_buckets():
+    histogram = Histogram()
+    for value in (0.0005, 0.001, 0.003, 60):
+        histogram.observe(value)
+    assert histogram.counts[0] == 2
+    assert histogram.counts[BUCKETS.index(0.005)] == 1
+    assert histogram.counts[-1] == 1
+    assert histogram.count == 4
+
+
+@pytest.fixture
+def instrumented():
+    app = Flask(__name__)
+    engine = create_engine("sqlite://")
+    metrics = Metrics()
+    init_metrics(app, engine, metrics)
+
+    @app.route("/two_queries")
+    def two_queries():
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            with pytest.raises(OperationalError):
+                conn.execute(text("select * from no_such_table"))
+            conn.execute(text("select 2"))
+            return {"query_start" in conn.info: 1}
+
+    return app, metrics
+
+
+def test_requests_and_queries_are_recorded(instrumented):
+    app, metrics = instrumented
+    response = app.test_client().get("/two_queries")
+
+    # A failed statement leaves no start time behind on the connection
+    assert response.get_json() == {"false": 1}
+    assert metrics.sql_queries == {"two_queries": 2}
+
+    text_format = metrics.render()
+    assert 'exam_request_duration_seconds_count{endpoint="two_queries",method="GET",status="2xx"} 1' in text_format
+    assert 'exam_sql_queries_total{endpoint="two_queries"} 2' in text_format
@@ -0,0 +1,31 @@
+import io
+
+from excel_import import import_questions
+
+
+def test_question_bank_round_trips_matching_settings(A, client):
+    with A.app.app_context():
+        exams = [A.Exam(title=t, grade_id=1, duration=30, version_count=1, created_by=1)
+                 for t in ("Source", "Copy")]
+        A.db.session.add_all(exams)
+        A.db.session.commit()
+        source, copy = (e.id for e in exams)
+        A.db.session.add(A.Question(exam_id=source, question_text="Powerhouse?", type="Short", points=1,
+                                    correct_answer="mitochondria", answer_variants="mitochondrion",
+                                    max_edits=0))
+        A.db.session.commit()
+
+    with client.session_transaction() as session:
+        session["role"] = "Teacher"
+    response = client.get(f"/export/questions/{source}?format=xlsx")
+    assert response.status_code == 200
+    workbook = io.BytesIO(response.get_data())
+
+    with A.app.app_context():
+        report = import_questions(A.db.session, A.Question.__table__, copy, workbook)
+        A.db.session.commit()
+        assert report.errors == []
+
+        q = A.Question.query.filter_by(exam_id=copy).one()
+        assert q.answer_variants == "mitochondrion"
+        assert q.max_edits == 0
@@ -0,0 +1,44 @@
+import question_search
+
+
+def test_match_query_quotes_words_as_prefixes():
+    assert question_search.to_match_query('mito "OR" cell-wall*') == '"mito"* "OR"* "cell"* "wall"*'
+    assert question_search.to_match_query("  ?! ") == ""
+
+
+def found(A, query, **filters):
+    rows, _ = question_search.search(A.db.session, query, filters)
+    return [row["id"] for row in rows]
+
+
+# Every write to the question table reaches the index through the triggers
+def test_index_follows_inserts_updates_and_deletes(A):
+    with A.app.app_context():
+        exam = A.Exam(title="Search", grade_id=1, duration=30, version_count=1, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        in_text = A.Question(exam_id=exam.id, type="Short", points=1,
+                             question_text="Where does the zyxoplast divide?", correct_answer="stroma")
+        in_answer = A.Question(exam_id=exam.id, type="Short", points=1,
+                               question_text="Name the organelle", correct_answer="zyxoplast")
+        A.db.session.add_all([in_text, in_answer])
+        A.db.session.commit()
+        text_id, answer_id = in_text.id, in_answer.id
+
+        # Prefix match; the question text outranks the answer column
+        assert found(A, "zyxo") == [text_id, answer_id]
+        assert found(A, "zyxoplast divide") == [text_id]
+        assert found(A, "zyxoplast", type="MCQ") == []
+
+        in_text.question_text = "Where does the quorvesicle bud?"
+        A.db.session.commit()
+        assert found(A, "zyxoplast") == [answer_id]
+        assert found(A, "quorvesicle", exam_id=exam.id) == [text_id]
+
+        A.db.session.delete(in_answer)
+        A.db.session.commit()
+        assert found(A, "zyxoplast") == []
+
+        # A rebuild from the content table gives the same answers
+        question_search.rebuild_index(A.db.engine)
+        assert found(A, "quorvesicle") == [text_id]
@@ -0,0 +1,84 @@
+from regrade import ResponseMatrix, score_matrix
+from response_store import bulk_insert, pack_answers
+
+
+QUESTIONS = (
+    dict(type="MCQ", option_a="Nucleus", option_b="Ribosome", option_c="Mitochondria",
+         option_d="Golgi body", correct_answer="C"),
+    dict(type="TF", correct_answer="True"),
+    dict(type="Short", correct_answer="photosynthesis"),
+    dict(type="Fill", fill_answers="chlorophyll, chloroplast"),
+    dict(type="Match", match_pairs="DNA:nucleus,ATP:mitochondria"),
+)
+
+
+def answer_sets(qids):
+    mcq, tf, short, fill, match = qids
+    return [
+        {mcq: "C", tf: "True", short: "Photosynthesis ", fill: "chlorophyll", match: ("Nucleus", "mitochondria")},
+        {mcq: "A", tf: "False", short: "respiration", match: ("mitochondria", "nucleus")},
+        {mcq: "C", short: "", fill: "", match: ("", "")},
+        {tf: "True", fill: "Chloroplast", 9999: "not on this exam"},
+        {},
+    ]
+
+
+def make_exam(A, title):
+    exam = A.Exam(title=title, grade_id=1, duration=30, version_count=1, created_by=1)
+    A.db.session.add(exam)
+    A.db.session.commit()
+    questions = [A.Question(exam_id=exam.id, question_text=f"Q{i}", points=2, **fields)
+                 for i, fields in enumerate(QUESTIONS)]
+    A.db.session.add_all(questions)
+    A.db.session.commit()
+    return exam.id, [q.id for q in questions]
+
+
+def test_packed_rows_score_like_answer_dicts(A):
+    with A.app.app_context():
+        exam_id, qids = make_exam(A, "Regrade matrix")
+        key = A.get_answer_key(exam_id)
+
+        from_dicts = ResponseMatrix(key)
+        packed = ResponseMatrix(key, capacity=1)
+        for attempt_id, answers in enumerate(answer_sets(qids) * 3):
+            from_dicts.add(attempt_id, answers)
+            packed.add_packed(attempt_id, pack_answers(answers))
+
+        assert packed.attempt_ids == from_dicts.attempt_ids
+        assert (packed.codes == from_dicts.codes).all()
+        assert list(score_matrix(packed)) == list(score_matrix(from_dicts))
+        assert list(score_matrix(packed))[:5] == [10, 0, 2, 4, 0]
+
+
+def test_regrade_rebuilds_only_the_exams_summaries(A):
+    with A.app.app_context():
+        exam_id, qids = make_exam(A, "Regrade scope")
+        attempts = [A.Attempt(student_name=f"Student {i}", grade=grade, exam_id=exam_id,
+                              score=0, violations=0)
+                    for i, grade in enumerate(["31", "31", "32", "32", "32"])]
+        A.db.session.add_all(attempts)
+        A.db.session.commit()
+        bulk_insert(A.db.session, A.AttemptResponse, [
+            {"attempt_id": attempt.id, "exam_id": exam_id, "answers": answers}
+            for attempt, answers in zip(attempts, answer_sets(qids))
+        ])
+        # Another exam's summary (here deliberately stale) is not touched
+        A.db.session.add(A.ScoreSummary(scope="exam", scope_key="987654", count=7, total=7))
+        A.db.session.commit()
+
+        assert A.regrade_exam(exam_id) == (5, 3)
+
+        summaries = {(s.scope, s.scope_key): (s.count, s.total) for s in A.ScoreSummary.query}
+        assert summaries[("exam", str(exam_id))] == (5, 16)
+        assert summaries[("grade", "31")] == (2, 10)
+        assert summaries[("grade", "32")] == (3, 6)
+        assert summaries[("exam", "987654")] == (7, 7)
+
+
+def test_regrade_of_unknown_exam_is_not_found(A, client):
+    with client.session_transaction() as session:
+        session["role"] = "Teacher"
+    assert client.post("/regrade_exam/424242").status_code == 404
+    with A.app.app_context():
+        assert A.regrade_exam(424242) is None
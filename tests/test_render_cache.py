@@ -0,0 +1,52 @@
+from render_cache import FragmentCache
+
+
+def renderer(html, calls):
+    def render():
+        calls.append(html)
+        return html
+    return render
+
+
+def test_renders_once_per_version():
+    cache, calls = FragmentCache(), []
+    assert cache.get((1, 1), renderer("<p>v1</p>", calls)) == "<p>v1</p>"
+    assert cache.get((1, 1), renderer("<p>other</p>", calls)) == "<p>v1</p>"
+    assert calls == ["<p>v1</p>"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_is_evicted_by_count_and_size():
+    cache, calls = FragmentCache(max_entries=2, max_bytes=10), []
+    cache.get((1, 1), renderer("aaaa", calls))
+    cache.get((1, 2), renderer("bbbb", calls))
+    cache.get((1, 1), renderer("", calls))       # touch: (1, 2) is now oldest
+    cache.get((2, 1), renderer("cccc", calls))
+    assert len(cache) == 2
+    assert cache.get((1, 2), renderer("bbbb", calls)) == "bbbb"
+    assert calls == ["aaaa", "bbbb", "cccc", "bbbb"]
+
+    cache.get((3, 1), renderer("x" * 11, calls))  # larger than the whole budget
+    assert len(cache) == 0
+
+
+def test_invalidate_one_exam_or_everything():
+    cache, calls = FragmentCache(), []
+    for key in ((1, 1), (1, 2), (2, 1)):
+        cache.get(key, renderer(f"{key}", calls))
+
+    cache.invalidate(1)
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_fragment_rendered_during_invalidation_is_not_kept():
+    cache = FragmentCache()
+
+    def render():
+        cache.invalidate(1)
+        return "stale"
+
+    assert cache.get((1, 1), render) == "stale"
+    assert len(cache) == 0
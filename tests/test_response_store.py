@@ -0,0 +1,51 @@
+import pytest
+
+from response_store import FORMAT_VERSION, bulk_insert, pack_answers, stream_answers, unpack_answers
+
+ANSWERS = {
+    3: "A",
+    4: "False",
+    9: "photosynthesis",
+    200: ("nucleus", "", "mitochondria"),
+    100000: "ATP — adenosine triphosphate",
+    100001: " B ",
+}
+
+
+def test_pack_round_trip():
+    data = pack_answers(ANSWERS)
+    assert data[0] == FORMAT_VERSION
+    unpacked = unpack_answers(data)
+    assert unpacked == {**ANSWERS, 100001: "B"}
+    assert unpack_answers(pack_answers({})) == {}
+    assert unpack_answers(b"") == {}
+
+
+def test_fixed_answers_pack_small():
+    answers = {qid: "ABCD"[qid % 4] for qid in range(1, 51)}
+    assert len(pack_answers(answers)) == 101
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        unpack_answers(bytes([FORMAT_VERSION + 1, 1, 1]))
+
+
+def test_stream_answers_in_batches(A):
+    with A.app.app_context():
+        exam = A.Exam(title="Stream", grade_id=1, duration=10, version_count=1, created_by=1)
+        A.db.session.add(exam)
+        A.db.session.commit()
+        attempts = [A.Attempt(student_name=f"S{i}", grade="1", exam_id=exam.id, score=0, violations=0)
+                    for i in range(5)]
+        A.db.session.add_all(attempts)
+        A.db.session.commit()
+        bulk_insert(A.db.session, A.AttemptResponse, [
+            {"attempt_id": a.id, "exam_id": exam.id, "answers": {1: "ABCD"[i % 4]}}
+            for i, a in enumerate(attempts)
+        ], chunk_size=2)
+        A.db.session.commit()
+
+        streamed = list(stream_answers(A.db.session, A.AttemptResponse, exam.id, batch_size=2))
+        assert [attempt_id for attempt_id, _ in streamed] == [a.id for a in attempts]
+        assert [answers[1] for _, answers in streamed] == ["A", "B", "C", "D", "A"]
@@ -0,0 +1,91 @@
+from flask import Flask, session
+
+from server_session import BackendSessionInterface
+from shared_cache import Generations, MemoryBackend, SharedExamCache, make_backend
+
+
+def node(backend):
+    return SharedExamCache(backend, Generations(backend, ttl=0), "answer-key")
+
+
+# An edit invalidated on one node is seen by every other node
+def test_invalidation_reaches_other_nodes(tmp_path):
+    backend = make_backend(f"sqlite:///{tmp_path / 'cache.db'}")
+    first, second = node(backend), node(backend)
+    loads = []
+
+    def loader(exam_id):
+        loads.append(exam_id)
+        return {"exam": exam_id, "version": len(loads)}
+
+    assert first.get(1, loader) == {"exam": 1, "version": 1}
+    assert second.get(1, loader) == {"exam": 1, "version": 1}
+    assert loads == [1]
+
+    first.invalidate(1)
+    assert second.get(1, loader) == {"exam": 1, "version": 2}
+    assert first.get(1, loader) == {"exam": 1, "version": 2}
+
+    second.invalidate()
+    assert first.get(1, loader) == {"exam": 1, "version": 3}
+    assert first.get(2, lambda exam_id: None) is None
+    assert loads == [1, 1, 1]
+
+
+def test_generation_is_memoized_for_its_ttl():
+    backend = MemoryBackend()
+    generations = Generations(backend, ttl=60)
+    assert generations.current(1) == (0, 0)
+
+    backend.incr("gen:1")
+    assert generations.current(1) == (0, 0)
+    generations.bump(1)
+    assert generations.current(1) == (0, 2)
+
+
+def make_app(backend):
+    app = Flask(__name__)
+    app.secret_key = "test"
+    app.session_interface = BackendSessionInterface(backend)
+
+    @app.route("/set/<name>")
+    def set_name(name):
+        session["name"] = name
+        return "ok"
+
+    @app.route("/get")
+    def get_name():
+        return session.get("name", "-")
+
+    @app.route("/clear")
+    def clear():
+        session.clear()
+        return "ok"
+
+    return app
+
+
+# The cookie carries only an id; the data is in the backend, so another
+# node answers the same session, and an id the server never issued is
+# not adopted
+def test_server_sessions_are_shared_and_ids_come_from_the_server():
+    backend = MemoryBackend()
+    browser = make_app(backend).test_client()
+    browser.get("/set/Ana")
+    sid = browser.get_cookie("session").value
+    assert "Ana" not in sid
+    assert backend.get("session:" + sid) is not None
+
+    other_node = make_app(backend).test_client()
+    other_node.set_cookie("session", sid)
+    assert other_node.get("/get").get_data(as_text=True) == "Ana"
+
+    forged = make_app(backend).test_client()
+    forged.set_cookie("session", "A" * 43)
+    forged.get("/set/Mallory")
+    assert forged.get_cookie("session").value != "A" * 43
+    assert backend.get("session:" + "A" * 43) is None
+
+    browser.get("/clear")
+    assert browser.get_cookie("session") is None
+    assert backend.get("session:" + sid) is None
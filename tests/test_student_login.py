@@ -0,0 +1,27 @@
+import re
+
+
+def test_student_login_page_posts_to_student_login(client):
+    page = client.get("/student_login_page")
+    assert page.status_code == 200
+
+    html = page.get_data(as_text=True)
+    assert 'action="/student_login"' in html
+    for field in ("student_name", "grade", "class_code"):
+        assert re.search(rf'name="{field}"', html)
+
+    response = client.post("/student_login", data={
+        "student_name": "Ada Student", "grade": "1", "class_code": "2025"
+    })
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/select_exam")
+
+    with client.session_transaction() as session:
+        assert session["student_name"] == "Ada Student"
+        assert session["grade"] == "1"
+
+
+def test_superadmin_login_page_renders(client):
+    page = client.get("/superadmin_login")
+    assert page.status_code == 200
+    assert 'name="code"' in page.get_data(as_text=True)
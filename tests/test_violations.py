@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from violations import ViolationBuffer, aggregate, parse_events
+
+
+NOW = datetime(2025, 3, 1, 10, 30, 15)
+
+
+def millis(at):
+    return at.timestamp() * 1000
+
+
+def test_parse_events_drops_unknown_kinds_and_clamps_timestamps():
+    raw = [
+        {"type": "blur", "t": millis(NOW - timedelta(seconds=10))},
+        {"type": "hidden", "t": millis(NOW - timedelta(hours=2))},
+        {"type": "paste", "t": "soon"},
+        {"type": "devtools", "t": millis(NOW)},
+        "blur",
+    ]
+    assert parse_events(raw, now=NOW) == [
+        ("blur", NOW - timedelta(seconds=10)),
+        ("hidden", NOW),
+        ("paste", NOW),
+    ]
+    assert parse_events({"type": "blur"}, now=NOW) == []
+
+
+def row(student, at, exam_id=1):
+    return {"exam_id": exam_id, "student_key": student.lower(), "student_name": student, "kind": "blur", "at": at}
+
+
+def test_aggregate_counts_per_minute_and_per_student():
+    rows = [
+        row("Ana", NOW),
+        row("Ana", NOW + timedelta(seconds=30)),
+        row("Ben", NOW + timedelta(seconds=50)),
+        row("Ana", NOW - timedelta(seconds=5)),
+    ]
+    per_minute, per_student = aggregate(rows)
+
+    assert per_minute == {(1, datetime(2025, 3, 1, 10, 30)): 3, (1, datetime(2025, 3, 1, 10, 31)): 1}
+    assert per_student == {
+        (1, "ana"): [3, NOW + timedelta(seconds=30), "Ana"],
+        (1, "ben"): [1, NOW + timedelta(seconds=50), "Ben"],
+    }
+
+
+# A failed flush keeps the events, ahead of those that arrived meanwhile
+def test_failed_flush_requeues_the_events():
+    flushed = []
+    failing = [True]
+
+    def flush(rows):
+        if failing[0]:
+            raise RuntimeError("database is locked")
+        flushed.append(list(rows))
+
+    buffer = ViolationBuffer(flush, max_events=1000, interval=3600)
+    buffer.add(["a", "b"])
+    buffer.flush_now()
+    assert buffer.flushed == 0
+
+    buffer.add(["c"])
+    failing[0] = False
+    buffer.flush_now()
+    assert flushed == [["a", "b", "c"]]
+    assert buffer.flushed == 3
+
+
+def test_full_buffer_drops_new_events():
+    flushed = []
+    buffer = ViolationBuffer(flushed.extend, max_events=1000, interval=3600, max_buffer=3)
+    buffer.add(["a", "b"])
+    buffer.add(["c", "d", "e"])
+    buffer.flush_now()
+    assert buffer.dropped == 2
+    assert flushed == ["a", "b", "c"]
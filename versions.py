@@ -0,0 +1,110 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — EXAM VERSIONS
+# Deterministic, pre-generated question/option orders per exam version
+# =========================================
+#
+# Each of an exam's version_count versions is built once from seeded RNGs
+# (question order: exam id + version number), so the same version always
+# has the same order and can be rebuilt identically at any time. An
+# ExamPaper holds only what the student sees: the answer key never goes
+# into it.
+#
+# MCQ options are shuffled too, each question from its own seed (exam id +
+# version + question id): adding or removing a question rebuilds the
+# versions but leaves every other question's option order as it was, so
+# a student who is mid-exam keeps the letters they were shown. The form
+# posts the *displayed* letter; to_original() maps it back through the
+# version's permutation before the answers are scored or stored.
+
+import json
+import random
+
+
+LETTERS = "ABCD"
+
+
+class ExamPaper:
+    __slots__ = ("exam_id", "version", "title", "duration", "questions", "option_orders")
+
+    def __init__(self, exam_id, version, title, duration, questions):
+        self.exam_id = exam_id
+        self.version = version
+        self.title = title
+        self.duration = duration
+        self.questions = questions
+
+        # {question_id: "CADB"} -> displayed A is original C, etc.
+        self.option_orders = {
+            q["id"]: "".join(letter for letter, _ in q["options"])
+            for q in questions if q["type"] == "MCQ"
+        }
+
+    # ----------------------------------
+    # Displayed MCQ letters -> original letters (other answers untouched)
+    # ----------------------------------
+    def to_original(self, answers):
+        mapped = dict(answers)
+
+        for qid, order in self.option_orders.items():
+            answer = mapped.get(qid)
+            if not answer:
+                continue
+
+            index = LETTERS.find(answer.strip().upper())
+            if 0 <= index < len(order):
+                mapped[qid] = order[index]
+
+        return mapped
+
+    def to_json(self):
+        return json.dumps({
+            "title": self.title,
+            "duration": self.duration,
+            "questions": self.questions,
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, exam_id, version, payload):
+        data = json.loads(payload)
+        return cls(exam_id, version, data["title"], data["duration"], data["questions"])
+
+
+# ----------------------------------
+# What a student sees for one question (no answers)
+# ----------------------------------
+def display_question(q, rng):
+    item = {"id": q.id, "type": q.type, "text": q.question_text}
+
+    if q.type == "MCQ":
+        options = [
+            (letter, text)
+            for letter, text in zip(LETTERS, (q.option_a, q.option_b, q.option_c, q.option_d))
+            if text
+        ]
+        rng.shuffle(options)
+        item["options"] = options
+
+    elif q.type == "Match":
+        item["match_left"] = [pair.partition(":")[0] for pair in (q.match_pairs or "").split(",")]
+
+    elif q.type == "Image":
+        item["image_path"] = q.image_path
+
+    return item
+
+
+def build_papers(exam, questions):
+    questions = sorted(questions, key=lambda q: q.id)
+    papers = []
+
+    for version in range(1, (exam.version_count or 1) + 1):
+        rng = random.Random(f"{exam.id}:{version}")
+        order = list(questions)
+        rng.shuffle(order)
+
+        papers.append(ExamPaper(
+            exam.id, version, exam.title, exam.duration,
+            [display_question(q, random.Random(f"{exam.id}:{version}:{q.id}")) for q in order]
+        ))
+
+    return papers
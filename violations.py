@@ -0,0 +1,138 @@
+# =========================================
+# SMART BIOLOGY EXAM SYSTEM — VIOLATION EVENTS
+# Batched ingestion, in-memory buffer with bulk flush, rolling aggregates
+# =========================================
+#
+# anti_cheat.js posts small batches of timestamped events. Each web process
+# appends them to a ViolationBuffer and answers at once; a background
+# thread hands everything buffered to flush() every `interval` seconds (or
+# sooner once `max_events` are waiting). One flush = one transaction that
+# bulk-inserts the raw events and bumps the per-minute and per-student
+# aggregates the proctor view reads, whatever the number of events.
+
+import atexit
+import logging
+import threading
+from datetime import datetime, timedelta
+
+
+log = logging.getLogger("exam.violations")
+
+KINDS = ("hidden", "blur", "paste")
+MAX_EVENTS_PER_REQUEST = 100
+
+# Client timestamps further from the server clock than this are clamped
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+
+# ----------------------------------
+# Request body -> [(kind, at)] (bad entries are dropped)
+# ----------------------------------
+def parse_events(raw, now=None):
+    now = now or datetime.now()
+    events = []
+
+    if not isinstance(raw, list):
+        return events
+
+    for item in raw[:MAX_EVENTS_PER_REQUEST]:
+        if not isinstance(item, dict) or item.get("type") not in KINDS:
+            continue
+        try:
+            at = datetime.fromtimestamp(float(item["t"]) / 1000)
+        except (KeyError, TypeError, ValueError, OverflowError, OSError):
+            at = now
+        if abs(at - now) > MAX_CLOCK_SKEW:
+            at = now
+        events.append((item["type"], at))
+
+    return events
+
+
+def minute_of(at):
+    return at.replace(second=0, microsecond=0)
+
+
+# ----------------------------------
+# Buffered rows -> aggregate deltas
+# ----------------------------------
+# rows are dicts with exam_id, student_key, student_name, kind, at.
+# Returns ({(exam_id, minute): count},
+#          {(exam_id, student_key): [count, last_at, student_name]})
+def aggregate(rows):
+    per_minute = {}
+    per_student = {}
+
+    for row in rows:
+        minute_id = (row["exam_id"], minute_of(row["at"]))
+        per_minute[minute_id] = per_minute.get(minute_id, 0) + 1
+
+        student_id = (row["exam_id"], row["student_key"])
+        s = per_student.get(student_id)
+        if s is None:
+            per_student[student_id] = [1, row["at"], row["student_name"]]
+        else:
+            s[0] += 1
+            s[1] = max(s[1], row["at"])
+
+    return per_minute, per_student
+
+
+class ViolationBuffer:
+
+    def __init__(self, flush, max_events=2000, interval=2.0, max_buffer=200000):
+        self.flush = flush
+        self.max_events = max_events
+        self.interval = interval
+        self.max_buffer = max_buffer
+        self._rows = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.flushed = 0
+        self.dropped = 0
+
+    def _ensure_started(self):
+        # Started lazily so each gunicorn worker gets its own live thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="violation-flush", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush_now)
+
+    def add(self, rows):
+        self._ensure_started()
+        with self._lock:
+            room = self.max_buffer - len(self._rows)
+            if room < len(rows):
+                # The database is not keeping up; losing proctoring
+                # events beats running out of memory during an exam
+                self.dropped += len(rows) - max(room, 0)
+                rows = rows[:max(room, 0)]
+            self._rows.extend(rows)
+            full = len(self._rows) >= self.max_events
+
+        if full:
+            self._wake.set()
+
+    def flush_now(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+
+        try:
+            self.flush(rows)
+            self.flushed += len(rows)
+        except Exception:
+            log.exception("flushing %d violation events failed; keeping them for the next try", len(rows))
+            with self._lock:
+                self._rows[:0] = rows[:self.max_buffer - len(self._rows)]
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush_now()